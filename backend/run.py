@@ -12,7 +12,6 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config.settings import settings
-from utils.ip_detector import setup_frontend_env
 
 print(settings.TOGETHER_API_KEY)
 
@@ -23,7 +22,14 @@ def main():
 
     # Auto-detect IP and update frontend .env file
     print("\n🔧 Setting up frontend environment...")
-    detected_ip = setup_frontend_env(settings.PORT)
+    try:
+        from utils.ip_detector import setup_frontend_env
+
+        detected_ip = setup_frontend_env(settings.PORT)
+    except Exception as e:
+        # The server can still start; the frontend .env just is not updated
+        print(f"⚠️ Skipping frontend environment setup: {e}")
+        detected_ip = settings.HOST
 
     print(f"\n📍 Server will run on: http://{settings.HOST}:{settings.PORT}")
     print(f"🌐 Accessible at: http://{detected_ip}:{settings.PORT}")
@@ -107,7 +107,7 @@ async def generate_content_async(
     Generate content asynchronously using Together.ai API.
     Uses semaphore-based throttling and dedicated thread pools.
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     # Use semaphore to limit concurrent AI requests and prevent overload
     async with request_semaphore:
@@ -137,8 +137,7 @@ async def generate_content_async(
 
                 if response:
                     # Record performance metrics
-                    end_time = time.time()
-                    response_time = end_time - start_time
+                    response_time = (time.perf_counter_ns() - start_ns) / 1e9
 
                     with request_times_lock:
                         request_times.append(response_time)
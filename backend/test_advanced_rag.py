@@ -69,7 +69,7 @@ async def test_simple_rag():
     # Test topic-specific retrieval
     topic = "supervised learning"
     
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     try:
         result = await rag_service.retrieve_context(
@@ -79,9 +79,9 @@ async def test_simple_rag():
             top_k=8
         )
         
-        end_time = time.time()
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
         
-        print(f"\n✓ Retrieval completed in {end_time - start_time:.2f} seconds")
+        print(f"\n✓ Retrieval completed in {elapsed:.2f} seconds")
         print(f"Status: {result['status']}")
         print(f"Chunks retrieved: {result['num_chunks']}")
         
@@ -106,7 +106,7 @@ async def test_advanced_rag():
     test_filename = "ML_Introduction.pdf"
     topic = "supervised learning"
     
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     try:
         result = await advanced_rag_service.retrieve_for_questions(
@@ -117,9 +117,9 @@ async def test_advanced_rag():
             mode="focused"
         )
         
-        end_time = time.time()
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
         
-        print(f"\n✓ Advanced retrieval completed in {end_time - start_time:.2f} seconds")
+        print(f"\n✓ Advanced retrieval completed in {elapsed:.2f} seconds")
         print(f"Status: {result['status']}")
         print(f"Chunks retrieved: {result['num_chunks']}")
         print(f"Retrieval method: {result.get('retrieval_method', 'N/A')}")
@@ -40,7 +40,7 @@ class TogetherIntegrationTester:
 
     def __init__(self):
         self.test_results = []
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
 
     def log_test_result(
         self,
@@ -67,8 +67,7 @@ class TogetherIntegrationTester:
 
     def print_summary(self):
         """Print test summary"""
-        end_time = time.time()
-        duration = end_time - self.start_time
+        duration = (time.perf_counter_ns() - self.start_ns) / 1e9
 
         passed = sum(1 for r in self.test_results if r["success"])
         total = len(self.test_results)
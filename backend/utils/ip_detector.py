@@ -10,10 +10,7 @@ import socket
 import os
 import re
 from pathlib import Path
-import logging
-
-# Create a logger
-ip_logger = logging.getLogger(__name__)
+from utils.logger import ip_logger
 
 def get_local_ip():
     """
@@ -64,6 +61,12 @@ def update_frontend_env(ip_address, port=8000):
         api_url_pattern = r'^NEXT_PUBLIC_API_BASE_URL=.*$'
         new_line = f"NEXT_PUBLIC_API_BASE_URL={new_api_url}"
         
+        # Leave the file untouched when the IP has not changed, so restarts
+        # don't rewrite it (and trigger a frontend env reload) for nothing
+        if new_line in content.splitlines():
+            ip_logger.info("Frontend .env file already up to date", api_url=new_api_url)
+            return
+        
         if re.search(api_url_pattern, content, re.MULTILINE):
             # Replace existing line
             updated_content = re.sub(api_url_pattern, new_line, content, flags=re.MULTILINE)
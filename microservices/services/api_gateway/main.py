@@ -45,6 +45,7 @@ async def lifespan(app: FastAPI):
     
     # Startup
     logger.info("Starting API Gateway...")
+    db_manager.init_session_factories()
     
     # Initialize HTTP client with connection pooling
     http_client = httpx.AsyncClient(
@@ -74,6 +75,7 @@ async def lifespan(app: FastAPI):
     if http_client:
         await http_client.aclose()
     await redis_manager.close()
+    await db_manager.close_async_engine()
     logger.info("API Gateway shutdown complete")
 
 app = FastAPI(
@@ -367,7 +369,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         workers=1,
-        loop="asyncio",
+        loop="uvloop",
+        http="httptools",
         access_log=True,
         log_level="info"
     )
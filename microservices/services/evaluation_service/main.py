@@ -14,19 +14,21 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
+from sqlalchemy import select
 import logging
 
 # Import shared modules
 import sys
 sys.path.append('/app/shared')
 
-from database.config import db_manager, get_async_db_session
-from database.models import Evaluation, Question, PDF, PDFExtractedText, QuizSession
-from cache.redis_config import redis_manager, evaluation_cache
+from database.config import db_manager, get_async_db_session, maintain_partitions_periodically
+from database.models import Evaluation, Question, PDF, PDFExtractedText, QuizSession, parse_uuid
+from cache.redis_config import redis_manager, evaluation_cache, expire_local_caches_periodically, start_local_cache_expiry_thread
 from ai.api_key_manager import get_api_key, record_api_request
 
 # Celery for background processing
 from celery import Celery
+from celery.signals import worker_process_init
 import google.generativeai as genai
 
 # Configure logging
@@ -53,13 +55,26 @@ celery_app.conf.update(
     worker_max_tasks_per_child=100,
 )
 
+# The local cache tier is filled in each worker process, so sweep it there
+@worker_process_init.connect
+def start_worker_cache_expiry(**kwargs):
+    """Start the local cache expiry sweep in each Celery worker process"""
+    start_local_cache_expiry_thread()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
     logger.info("Starting Evaluation Service...")
+    db_manager.init_session_factories()
+    await db_manager.warmup_pool()
+    partition_task = asyncio.create_task(maintain_partitions_periodically())
+    expiry_task = asyncio.create_task(expire_local_caches_periodically())
     yield
     logger.info("Shutting down Evaluation Service...")
+    partition_task.cancel()
+    expiry_task.cancel()
     await redis_manager.close()
+    await db_manager.close_async_engine()
 
 app = FastAPI(
     title="Evaluation Service",
@@ -218,7 +233,7 @@ async def evaluate_open_ended_batch(
         return cached_results
     
     # Get API key for AI evaluation
-    key_info = await get_api_key()
+    key_info = get_api_key()
     if not key_info:
         raise Exception("No API key available")
     
@@ -295,7 +310,7 @@ Evaluate all {len(uncached_answers)} answers. Be constructive and encouraging wh
         response_time = time.time() - start_time
         
         # Record successful API request
-        await record_api_request(key_id, True, response_time)
+        record_api_request(key_id, True, response_time)
         
         if not response or not response.text:
             raise Exception("Empty response from AI")
@@ -359,7 +374,7 @@ Evaluate all {len(uncached_answers)} answers. Be constructive and encouraging wh
     
     except Exception as e:
         response_time = time.time() - start_time
-        await record_api_request(key_id, False, response_time)
+        record_api_request(key_id, False, response_time)
         
         # Return fallback results for uncached answers
         fallback_results = []
@@ -390,12 +405,15 @@ async def process_quiz_evaluation(quiz_data: dict) -> dict:
     evaluation_level = quiz_data.get('evaluation_level', 'medium')
     
     # Get PDF content
-    async with db_manager.get_async_session() as session:
+    async with db_manager.get_async_read_session() as session:
         pdf = await session.get(PDF, pdf_id)
         if not pdf:
             raise Exception("PDF not found")
         
-        extracted_text = await session.get(PDFExtractedText, pdf_id)
+        # Keyed by pdf_id, not by primary key, so session.get() does not apply
+        extracted_text = await session.scalar(
+            select(PDFExtractedText).where(PDFExtractedText.pdf_id == pdf_id)
+        )
         if not extracted_text:
             raise Exception("PDF content not found")
         
@@ -514,6 +532,11 @@ async def process_quiz_evaluation(quiz_data: dict) -> dict:
 async def evaluate_single_answer(request: AnswerEvaluationRequest):
     """Evaluate a single answer"""
     
+    # Validate before the cache lookup, like the other request bodies
+    question_uuid = parse_uuid(request.question_id)
+    if question_uuid is None:
+        raise HTTPException(status_code=422, detail="Invalid question_id")
+    
     # Check cache first
     question_hash = hashlib.md5(request.question.encode()).hexdigest()
     answer_hash = generate_answer_hash(request.question, request.user_answer)
@@ -537,13 +560,15 @@ async def evaluate_single_answer(request: AnswerEvaluationRequest):
     )
     
     # Get PDF content (simplified - in production, this should be optimized)
-    async with db_manager.get_async_session() as session:
-        question = await session.get(Question, request.question_id)
+    async with db_manager.get_async_read_session() as session:
+        question = await session.get(Question, question_uuid)
         if not question:
             raise HTTPException(status_code=404, detail="Question not found")
         
         pdf = await session.get(PDF, question.pdf_id)
-        extracted_text = await session.get(PDFExtractedText, question.pdf_id)
+        extracted_text = await session.scalar(
+            select(PDFExtractedText).where(PDFExtractedText.pdf_id == question.pdf_id)
+        )
         
         if not pdf or not extracted_text:
             raise HTTPException(status_code=404, detail="PDF content not found")
@@ -559,6 +584,13 @@ async def evaluate_single_answer(request: AnswerEvaluationRequest):
 async def evaluate_quiz(request: QuizSubmissionRequest, background_tasks: BackgroundTasks):
     """Evaluate a complete quiz submission"""
     
+    if parse_uuid(request.user_id) is None:
+        raise HTTPException(status_code=422, detail="Invalid user_id")
+    if parse_uuid(request.pdf_id) is None:
+        raise HTTPException(status_code=422, detail="Invalid pdf_id")
+    if any(parse_uuid(answer.question_id) is None for answer in request.answers):
+        raise HTTPException(status_code=422, detail="Invalid question_id")
+    
     # For small quizzes (< 10 questions), process immediately
     if len(request.answers) < 10:
         result = await process_quiz_evaluation(request.dict())
@@ -583,7 +615,7 @@ async def health_check():
 async def get_stats():
     """Get service statistics"""
     from ai.api_key_manager import get_api_stats
-    api_stats = await get_api_stats()
+    api_stats = get_api_stats()
     
     return {
         "service": "evaluation",
@@ -593,4 +625,4 @@ async def get_stats():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8003)
+    uvicorn.run(app, host="0.0.0.0", port=8003, loop="uvloop", http="httptools")
@@ -13,19 +13,21 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket, WebSocke
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
+from sqlalchemy import select
 import logging
 
 # Import shared modules
 import sys
 sys.path.append('/app/shared')
 
-from database.config import db_manager, get_async_db_session
-from database.models import Question, PDF, BackgroundJob, PDFExtractedText
-from cache.redis_config import redis_manager, question_cache
+from database.config import db_manager, get_async_db_session, maintain_partitions_periodically
+from database.models import Question, PDF, BackgroundJob, PDFExtractedText, parse_uuid
+from cache.redis_config import redis_manager, question_cache, start_local_cache_expiry_thread
 from ai.api_key_manager import get_api_key, record_api_request
 
 # Celery for background processing
 from celery import Celery
+from celery.signals import worker_process_init
 import google.generativeai as genai
 
 # Configure logging
@@ -52,6 +54,12 @@ celery_app.conf.update(
     worker_max_tasks_per_child=50,
 )
 
+# The local cache tier is filled in each worker process, so sweep it there
+@worker_process_init.connect
+def start_worker_cache_expiry(**kwargs):
+    """Start the local cache expiry sweep in each Celery worker process"""
+    start_local_cache_expiry_thread()
+
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
@@ -78,9 +86,14 @@ manager = ConnectionManager()
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
     logger.info("Starting Question Generation Service...")
+    db_manager.init_session_factories()
+    await db_manager.warmup_pool()
+    partition_task = asyncio.create_task(maintain_partitions_periodically())
     yield
     logger.info("Shutting down Question Generation Service...")
+    partition_task.cancel()
     await redis_manager.close()
+    await db_manager.close_async_engine()
 
 app = FastAPI(
     title="Question Generation Service",
@@ -157,7 +170,7 @@ async def generate_ai_questions(
     """Generate questions for a content chunk using AI"""
     
     # Get API key
-    key_info = await get_api_key()
+    key_info = get_api_key()
     if not key_info:
         raise Exception("No API key available")
     
@@ -219,7 +232,7 @@ async def generate_ai_questions(
         response_time = asyncio.get_event_loop().time() - start_time
         
         # Record successful API request
-        await record_api_request(key_id, True, response_time)
+        record_api_request(key_id, True, response_time)
         
         if not response or not response.text:
             raise Exception("Empty response from AI")
@@ -252,7 +265,7 @@ async def generate_ai_questions(
     
     except Exception as e:
         response_time = asyncio.get_event_loop().time() - start_time
-        await record_api_request(key_id, False, response_time)
+        record_api_request(key_id, False, response_time)
         raise
 
 # Celery task for background question generation
@@ -385,14 +398,17 @@ def generate_questions_task(self, pdf_id: str, topic: str, count: int, mode: str
 # Helper functions
 async def get_pdf_content(pdf_id: str) -> Optional[tuple]:
     """Get PDF content from database"""
-    async with db_manager.get_async_session() as session:
+    async with db_manager.get_async_read_session() as session:
         # Get PDF info
         pdf = await session.get(PDF, pdf_id)
         if not pdf:
             return None
         
         # Get extracted text
-        extracted_text = await session.get(PDFExtractedText, pdf_id)
+        # Keyed by pdf_id, not by primary key, so session.get() does not apply
+        extracted_text = await session.scalar(
+            select(PDFExtractedText).where(PDFExtractedText.pdf_id == pdf_id)
+        )
         if not extracted_text:
             return None
         
@@ -430,7 +446,7 @@ async def save_questions_to_db(
 ) -> List[Dict]:
     """Save generated questions to database"""
     async with db_manager.get_async_session() as session:
-        saved_questions = []
+        new_questions = []
         
         for i, q in enumerate(questions):
             if isinstance(q, str):
@@ -456,14 +472,22 @@ async def save_questions_to_db(
                     cache_key=generate_cache_key(pdf_id, topic or "", len(questions), mode)
                 )
             
-            session.add(question)
-            saved_questions.append({
+            new_questions.append(question)
+        
+        # Ids are assigned on flush (one batched INSERT), flush once so they can be returned
+        session.add_all(new_questions)
+        await session.flush()
+        
+        saved_questions = [
+            {
                 "id": question.id,
                 "question": question.question_text,
                 "type": question.question_type,
                 "options": question.options,
                 "correct_answer": question.correct_answer
-            })
+            }
+            for question in new_questions
+        ]
         
         await session.commit()
         return saved_questions
@@ -473,6 +497,11 @@ async def save_questions_to_db(
 async def generate_questions(request: QuestionGenerationRequest, background_tasks: BackgroundTasks):
     """Start question generation job"""
     
+    if parse_uuid(request.pdf_id) is None:
+        raise HTTPException(status_code=422, detail="Invalid pdf_id")
+    if parse_uuid(request.user_id) is None:
+        raise HTTPException(status_code=422, detail="Invalid user_id")
+    
     # Create background job record
     job = BackgroundJob(
         job_type="question_generation",
@@ -515,8 +544,12 @@ async def generate_questions(request: QuestionGenerationRequest, background_task
 @app.get("/api/questions/status/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(job_id: str):
     """Get question generation job status"""
+    job_uuid = parse_uuid(job_id)
+    if job_uuid is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
     async with db_manager.get_async_session() as session:
-        job = await session.get(BackgroundJob, job_id)
+        job = await session.get(BackgroundJob, job_uuid)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
@@ -549,7 +582,7 @@ async def get_stats():
     """Get service statistics"""
     # Get API key stats
     from ai.api_key_manager import get_api_stats
-    api_stats = await get_api_stats()
+    api_stats = get_api_stats()
     
     return {
         "service": "question_generation",
@@ -559,4 +592,4 @@ async def get_stats():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    uvicorn.run(app, host="0.0.0.0", port=8002, loop="uvloop", http="httptools")
@@ -7,14 +7,22 @@ import time
 import random
 import asyncio
 import logging
-from typing import List, Optional, Dict, Tuple
-from collections import defaultdict
+from typing import List, Optional, Dict, Tuple, Deque
+from collections import defaultdict, deque
 from threading import Lock
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Key selection score weights
+LOAD_WEIGHT = 0.4
+RATE_LIMIT_WEIGHT = 0.3
+RESPONSE_TIME_WEIGHT = 0.2
+FAILURE_WEIGHT = 0.1
+RESPONSE_TIME_CAP = 10.0  # seconds
+
 @dataclass
 class APIKeyStats:
     """Statistics for an API key"""
@@ -22,7 +30,7 @@ class APIKeyStats:
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
-    last_used: Optional[datetime] = None
+    last_used: Optional[float] = None  # Unix timestamp, formatted lazily in get_stats
     current_load: int = 0  # Current concurrent requests
     rate_limit_hits: int = 0
     average_response_time: float = 0.0
@@ -38,8 +46,10 @@ class APIKeyManager:
         self.keys_file_path = keys_file_path or self._find_keys_file()
         self.api_keys: List[str] = []
         self.key_stats: Dict[str, APIKeyStats] = {}
-        self.request_times: Dict[str, List[float]] = defaultdict(list)
-        self.rate_limit_windows: Dict[str, List[float]] = defaultdict(list)
+        self._key_ids: List[str] = []  # key_id for each index in api_keys
+        self._rr_start = 0  # Rotating scan start so score ties are spread across keys
+        self.request_times: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=100))
+        self.rate_limit_windows: Dict[str, Deque[float]] = defaultdict(deque)
         
         # Configuration
         self.max_requests_per_minute = int(os.getenv("API_MAX_REQUESTS_PER_MINUTE", "1800"))
@@ -47,6 +57,11 @@ class APIKeyManager:
         self.health_check_interval = int(os.getenv("API_HEALTH_CHECK_INTERVAL", "300"))  # 5 minutes
         self.max_concurrent_per_key = int(os.getenv("API_MAX_CONCURRENT_PER_KEY", "50"))
         
+        # Score coefficients, fixed for the lifetime of the process
+        self._load_coef = LOAD_WEIGHT / self.max_concurrent_per_key
+        self._rate_coef = RATE_LIMIT_WEIGHT / self.max_requests_per_minute
+        self._response_time_coef = RESPONSE_TIME_WEIGHT / RESPONSE_TIME_CAP
+        
         # Thread safety
         self.lock = Lock()
         
@@ -79,10 +94,14 @@ class APIKeyManager:
                 logger.error(f"API keys file not found: {self.keys_file_path}")
                 return
             
-            with open(self.keys_file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
+            data = Path(self.keys_file_path).read_bytes()
             
-            self.api_keys = [line.strip() for line in lines if line.strip()]
+            # Single pass: strip each line, skip blanks, decode survivors
+            self.api_keys = [
+                line.decode('utf-8')
+                for line in (raw.strip() for raw in data.splitlines())
+                if line
+            ]
             logger.info(f"Loaded {len(self.api_keys)} API keys")
             
         except Exception as e:
@@ -91,59 +110,46 @@ class APIKeyManager:
     
     def _initialize_stats(self) -> None:
         """Initialize statistics for all API keys"""
-        for i, key in enumerate(self.api_keys):
-            key_id = f"key_{i+1}"
+        self._key_ids = [f"key_{i+1}" for i in range(len(self.api_keys))]
+        for key_id in self._key_ids:
             self.key_stats[key_id] = APIKeyStats(key_id=key_id)
     
-    def _clean_old_requests(self, key_id: str) -> None:
-        """Clean old request timestamps outside the rate limit window"""
-        current_time = time.time()
+    def _clean_old_requests(self, key_id: str, current_time: Optional[float] = None) -> None:
+        """
+        Clean old request timestamps outside the rate limit window.
+        Timestamps come from time.monotonic() and are appended in order,
+        so expired ones are always at the front.
+        Response time tracking is bounded by its deque (last 100 requests).
+        """
+        if current_time is None:
+            current_time = time.monotonic()
         cutoff_time = current_time - self.rate_limit_window
         
-        # Clean rate limit tracking
-        self.rate_limit_windows[key_id] = [
-            req_time for req_time in self.rate_limit_windows[key_id]
-            if req_time > cutoff_time
-        ]
-        
-        # Clean response time tracking (keep last 100 requests)
-        if len(self.request_times[key_id]) > 100:
-            self.request_times[key_id] = self.request_times[key_id][-100:]
+        window = self.rate_limit_windows[key_id]
+        while window and window[0] <= cutoff_time:
+            window.popleft()
     
-    def _calculate_key_score(self, key_id: str) -> float:
+    def _calculate_key_score(self, stats: APIKeyStats, rate_limit_usage: int) -> float:
         """
         Calculate a score for key selection based on multiple factors.
         Lower score = better choice.
         """
-        stats = self.key_stats[key_id]
-        
         if not stats.is_healthy:
             return float('inf')  # Never select unhealthy keys
         
-        # Base score factors
-        load_factor = stats.current_load / self.max_concurrent_per_key
-        rate_limit_factor = len(self.rate_limit_windows[key_id]) / self.max_requests_per_minute
-        
-        # Response time factor (normalized)
-        response_time_factor = 0
-        if self.request_times[key_id]:
-            avg_response_time = sum(self.request_times[key_id]) / len(self.request_times[key_id])
-            response_time_factor = min(avg_response_time / 10.0, 1.0)  # Cap at 10 seconds
-        
         # Recent failures factor
         failure_rate = 0
         if stats.total_requests > 0:
             failure_rate = stats.failed_requests / stats.total_requests
         
-        # Combine factors with weights
-        score = (
-            load_factor * 0.4 +           # 40% weight on current load
-            rate_limit_factor * 0.3 +     # 30% weight on rate limiting
-            response_time_factor * 0.2 +  # 20% weight on response time
-            failure_rate * 0.1            # 10% weight on failure rate
+        # Weighted factors, with normalizers folded into the coefficients
+        return (
+            stats.current_load * self._load_coef +                        # 40% weight on current load
+            rate_limit_usage * self._rate_coef +                          # 30% weight on rate limiting
+            min(stats.average_response_time * self._response_time_coef,
+                RESPONSE_TIME_WEIGHT) +                                   # 20% weight on response time, capped at 10s
+            failure_rate * FAILURE_WEIGHT                                 # 10% weight on failure rate
         )
-        
-        return score
     
     def get_best_key(self) -> Optional[Tuple[str, str]]:
         """
@@ -155,36 +161,41 @@ class APIKeyManager:
                 logger.error("No API keys available")
                 return None
             
-            # Clean old request data for all keys
-            for key_id in self.key_stats.keys():
-                self._clean_old_requests(key_id)
+            current_time = time.monotonic()
             
-            # Find the best key based on scoring
-            best_key_id = None
+            # Find the best key based on scoring. The scan starts at a rotating
+            # offset, so on equal scores the first key seen (which wins) varies.
+            best_idx = -1
             best_score = float('inf')
+            num_keys = len(self._key_ids)
+            start = self._rr_start
             
-            for i, key in enumerate(self.api_keys):
-                key_id = f"key_{i+1}"
+            for offset in range(num_keys):
+                i = (start + offset) % num_keys
+                key_id = self._key_ids[i]
                 
-                # Check if key is within rate limits
+                # Check if key is within rate limits. Expired timestamps sit at the
+                # front of the window, so pruning every scanned key is amortized O(1).
+                self._clean_old_requests(key_id, current_time)
                 if len(self.rate_limit_windows[key_id]) >= self.max_requests_per_minute:
                     continue
                 
                 # Check if key is not overloaded
-                if self.key_stats[key_id].current_load >= self.max_concurrent_per_key:
+                stats = self.key_stats[key_id]
+                if stats.current_load >= self.max_concurrent_per_key:
                     continue
                 
-                score = self._calculate_key_score(key_id)
+                score = self._calculate_key_score(stats, len(self.rate_limit_windows[key_id]))
                 if score < best_score:
                     best_score = score
-                    best_key_id = key_id
+                    best_idx = i
             
-            if best_key_id is None:
+            if best_idx < 0:
                 logger.warning("All API keys are rate limited or overloaded")
                 # Fallback: use random key with lowest load
                 available_keys = [
-                    (f"key_{i+1}", key) for i, key in enumerate(self.api_keys)
-                    if self.key_stats[f"key_{i+1}"].is_healthy
+                    (key_id, self.api_keys[i]) for i, key_id in enumerate(self._key_ids)
+                    if self.key_stats[key_id].is_healthy
                 ]
                 if available_keys:
                     best_key_id, selected_key = min(
@@ -195,16 +206,16 @@ class APIKeyManager:
                 return None
             
             # Record the request
-            current_time = time.time()
+            self._rr_start = (start + 1) % num_keys
+            best_key_id = self._key_ids[best_idx]
             self.rate_limit_windows[best_key_id].append(current_time)
-            self.key_stats[best_key_id].current_load += 1
-            self.key_stats[best_key_id].total_requests += 1
-            self.key_stats[best_key_id].last_used = datetime.now()
-            
-            selected_key = self.api_keys[int(best_key_id.split('_')[1]) - 1]
+            stats = self.key_stats[best_key_id]
+            stats.current_load += 1
+            stats.total_requests += 1
+            stats.last_used = time.time()  # Wall clock, for display only
             
             logger.debug(f"Selected {best_key_id} with score {best_score:.3f}")
-            return best_key_id, selected_key
+            return best_key_id, self.api_keys[best_idx]
     
     def record_request_completion(self, key_id: str, success: bool, response_time: float) -> None:
         """Record the completion of a request"""
@@ -214,6 +225,7 @@ class APIKeyManager:
             
             stats = self.key_stats[key_id]
             stats.current_load = max(0, stats.current_load - 1)
+            self._clean_old_requests(key_id)
             
             if success:
                 stats.successful_requests += 1
@@ -248,22 +260,34 @@ class APIKeyManager:
     
     def get_stats(self) -> Dict[str, Dict]:
         """Get statistics for all API keys"""
+        # Copy the raw counters under the lock, format them after releasing it
+        # so dashboard polling does not stall key selection
         with self.lock:
-            stats = {}
+            current_time = time.monotonic()
+            snapshot = []
             for key_id, key_stats in self.key_stats.items():
-                stats[key_id] = {
-                    'total_requests': key_stats.total_requests,
-                    'successful_requests': key_stats.successful_requests,
-                    'failed_requests': key_stats.failed_requests,
-                    'current_load': key_stats.current_load,
-                    'rate_limit_hits': key_stats.rate_limit_hits,
-                    'average_response_time': key_stats.average_response_time,
-                    'is_healthy': key_stats.is_healthy,
-                    'last_used': key_stats.last_used.isoformat() if key_stats.last_used else None,
-                    'current_rate_limit_usage': len(self.rate_limit_windows[key_id]),
-                    'score': self._calculate_key_score(key_id) if key_stats.is_healthy else float('inf')
-                }
-            return stats
+                self._clean_old_requests(key_id, current_time)
+                snapshot.append((replace(key_stats), len(self.rate_limit_windows[key_id])))
+        
+        return {
+            key_stats.key_id: self._format_key_stats(key_stats, rate_limit_usage)
+            for key_stats, rate_limit_usage in snapshot
+        }
+    
+    def _format_key_stats(self, key_stats: APIKeyStats, rate_limit_usage: int) -> Dict:
+        """Build the public stats entry for a snapshot of one key"""
+        return {
+            'total_requests': key_stats.total_requests,
+            'successful_requests': key_stats.successful_requests,
+            'failed_requests': key_stats.failed_requests,
+            'current_load': key_stats.current_load,
+            'rate_limit_hits': key_stats.rate_limit_hits,
+            'average_response_time': key_stats.average_response_time,
+            'is_healthy': key_stats.is_healthy,
+            'last_used': datetime.fromtimestamp(key_stats.last_used).isoformat() if key_stats.last_used else None,
+            'current_rate_limit_usage': rate_limit_usage,
+            'score': self._calculate_key_score(key_stats, rate_limit_usage)
+        }
     
     def get_total_capacity(self) -> Dict[str, int]:
         """Get total system capacity information"""
@@ -291,18 +315,18 @@ class APIKeyManager:
 api_key_manager = APIKeyManager()
 
 # Convenience functions for services
-async def get_api_key() -> Optional[Tuple[str, str]]:
+def get_api_key() -> Optional[Tuple[str, str]]:
     """Get the best available API key"""
     return api_key_manager.get_best_key()
 
-async def record_api_request(key_id: str, success: bool, response_time: float) -> None:
+def record_api_request(key_id: str, success: bool, response_time: float) -> None:
     """Record API request completion"""
     api_key_manager.record_request_completion(key_id, success, response_time)
 
-async def record_rate_limit(key_id: str) -> None:
+def record_rate_limit(key_id: str) -> None:
     """Record rate limit hit"""
     api_key_manager.record_rate_limit_hit(key_id)
 
-async def get_api_stats() -> Dict[str, Dict]:
+def get_api_stats() -> Dict[str, Dict]:
     """Get API key statistics"""
     return api_key_manager.get_stats()
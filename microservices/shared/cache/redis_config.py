@@ -7,14 +7,55 @@ import json
 import pickle
 import hashlib
 import asyncio
+import time
+import orjson
 from typing import Any, Optional, Union, Dict, List
 from datetime import datetime, timedelta
+from threading import Lock, Thread
 import redis.asyncio as redis
 import logging
 from contextlib import asynccontextmanager
 
+try:
+    import xxhash
+except ImportError:  # Optional dependency, fall back to hashlib
+    xxhash = None
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency, fall back to pickle
+    msgpack = None
+
+try:
+    from cachetools import TTLCache
+except ImportError:  # Optional dependency, local cache tier is disabled
+    TTLCache = None
+
 logger = logging.getLogger(__name__)
 
+if xxhash is None:
+    logger.warning("xxhash not installed, cache key hashing falls back to hashlib.blake2b")
+if msgpack is None:
+    logger.warning("msgpack not installed, values orjson cannot encode fall back to pickle")
+if TTLCache is None:
+    logger.warning("cachetools not installed, the local (in-process) cache tier is disabled")
+
+# 1-byte format tags prepended to every serialized value
+_TAG_JSON = b'J'
+_TAG_MSGPACK = b'M'
+_TAG_PICKLE = b'P'
+
+def _hash_key_part(value: Any) -> str:
+    """Hash a non-scalar cache key component over its canonical JSON form"""
+    canonical = orjson.dumps(
+        value,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(canonical)[:12]
+    return hashlib.blake2b(canonical, digest_size=8).hexdigest()[:12]
+
 class RedisConfig:
     """Redis configuration settings"""
     
@@ -36,6 +77,11 @@ class RedisConfig:
         self.QUESTION_CACHE_TTL = int(os.getenv("QUESTION_CACHE_TTL", "86400"))  # 24 hours
         self.EVALUATION_CACHE_TTL = int(os.getenv("EVALUATION_CACHE_TTL", "7200"))  # 2 hours
         self.PDF_TEXT_CACHE_TTL = int(os.getenv("PDF_TEXT_CACHE_TTL", "604800"))  # 1 week
+        
+        # In-process cache settings (L1 in front of Redis)
+        self.LOCAL_CACHE_MAXSIZE = int(os.getenv("LOCAL_CACHE_MAXSIZE", "8192"))
+        self.LOCAL_CACHE_TTL = int(os.getenv("LOCAL_CACHE_TTL", "300"))  # 5 minutes
+        self.LOCAL_CACHE_EXPIRE_INTERVAL = int(os.getenv("LOCAL_CACHE_EXPIRE_INTERVAL", "60"))
 
 class RedisManager:
     """Redis connection manager with connection pooling and caching utilities"""
@@ -70,14 +116,26 @@ class RedisManager:
             logger.info("Closed Redis connection pool")
     
     def _serialize_data(self, data: Any) -> bytes:
-        """Serialize data for Redis storage"""
+        """Serialize data for Redis storage, prefixed with a 1-byte format tag"""
         try:
-            # Try JSON first for simple data types
+            # orjson for simple data types
             if isinstance(data, (dict, list, str, int, float, bool)) or data is None:
-                return json.dumps(data, default=str).encode('utf-8')
-            else:
-                # Use pickle for complex objects
-                return pickle.dumps(data)
+                try:
+                    return _TAG_JSON + orjson.dumps(
+                        data, default=str, option=orjson.OPT_NON_STR_KEYS
+                    )
+                except orjson.JSONEncodeError:
+                    pass  # e.g. integers beyond 64 bits
+            # msgpack for anything else it round-trips exactly. strict_types keeps
+            # tuples and dict/list subclasses out (msgpack would return them as
+            # plain lists/dicts), so those still go to pickle.
+            if msgpack is not None:
+                try:
+                    return _TAG_MSGPACK + msgpack.packb(data, use_bin_type=True, strict_types=True)
+                except (TypeError, ValueError, OverflowError):
+                    pass
+            # Use pickle for complex objects
+            return _TAG_PICKLE + pickle.dumps(data)
         except Exception as e:
             logger.error(f"Failed to serialize data: {e}")
             raise
@@ -85,7 +143,15 @@ class RedisManager:
     def _deserialize_data(self, data: bytes) -> Any:
         """Deserialize data from Redis"""
         try:
-            # Try JSON first
+            tag = data[:1]
+            if tag == _TAG_JSON:
+                return orjson.loads(data[1:])
+            if tag == _TAG_MSGPACK and msgpack is not None:
+                return msgpack.unpackb(data[1:], raw=False)
+            if tag == _TAG_PICKLE:
+                return pickle.loads(data[1:])
+            
+            # Untagged blobs written before the format tag was introduced
             try:
                 return json.loads(data.decode('utf-8'))
             except (json.JSONDecodeError, UnicodeDecodeError):
@@ -105,14 +171,14 @@ class RedisManager:
                 key_parts.append(str(arg))
             else:
                 # Hash complex objects
-                key_parts.append(hashlib.md5(str(arg).encode()).hexdigest()[:8])
+                key_parts.append(_hash_key_part(arg))
         
         # Add keyword arguments (sorted for consistency)
         for k, v in sorted(kwargs.items()):
             if isinstance(v, (str, int, float)):
                 key_parts.append(f"{k}:{v}")
             else:
-                key_parts.append(f"{k}:{hashlib.md5(str(v).encode()).hexdigest()[:8]}")
+                key_parts.append(f"{k}:{_hash_key_part(v)}")
         
         return ":".join(key_parts)
     
@@ -232,18 +298,49 @@ class RedisManager:
             logger.error(f"Failed to get hash {key}: {e}")
             return None
     
-    async def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching a pattern"""
+    async def get_hash_fields(self, key: str, fields: List[str]) -> Dict[str, Any]:
+        """Get only the requested fields of a hash from Redis"""
         try:
             client = await self.get_client()
-            keys = await client.keys(pattern)
+            values = await client.hmget(key, fields)
             
-            if keys:
-                deleted = await client.delete(*keys)
-                logger.info(f"Cleared {deleted} keys matching pattern: {pattern}")
-                return deleted
+            # Missing fields come back as None and are left out
+            return {
+                field: self._deserialize_data(value)
+                for field, value in zip(fields, values)
+                if value is not None
+            }
+        except Exception as e:
+            logger.error(f"Failed to get fields of hash {key}: {e}")
+            return {}
+    
+    async def _unlink_batch(self, client: redis.Redis, keys: List[bytes]) -> int:
+        """Unlink a batch of keys in a single non-transactional pipeline"""
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.unlink(key)
+            return sum(await pipe.execute())
+    
+    async def clear_pattern(self, pattern: str, batch_size: int = 512) -> int:
+        """Clear all keys matching a pattern without blocking the server"""
+        try:
+            client = await self.get_client()
+            deleted = 0
+            batch = []
             
-            return 0
+            # SCAN instead of KEYS, UNLINK instead of DELETE
+            async for key in client.scan_iter(match=pattern, count=1000):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += await self._unlink_batch(client, batch)
+                    batch.clear()
+            
+            if batch:
+                deleted += await self._unlink_batch(client, batch)
+            
+            if deleted:
+                logger.info(f"Cleared {deleted} keys matching pattern: {pattern}")
+            return deleted
         except Exception as e:
             logger.error(f"Failed to clear pattern {pattern}: {e}")
             return 0
@@ -266,6 +363,42 @@ class RedisManager:
             logger.error(f"Failed to get Redis info: {e}")
             return {}
 
+class LocalCache:
+    """In-process TTL LRU cache used as a first tier in front of Redis"""
+    
+    def __init__(self, maxsize: int, ttl: int):
+        # Disabled (every lookup misses) when cachetools is not installed
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl) if TTLCache is not None else None
+        self._lock = Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value if present and not expired"""
+        if self._cache is None:
+            return None
+        with self._lock:
+            return self._cache.get(key)
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        if self._cache is None or value is None:
+            return
+        with self._lock:
+            self._cache[key] = value
+    
+    def invalidate(self, key: str) -> None:
+        """Drop a single key"""
+        if self._cache is None:
+            return
+        with self._lock:
+            self._cache.pop(key, None)
+    
+    def expire(self) -> None:
+        """Evict all expired entries"""
+        if self._cache is None:
+            return
+        with self._lock:
+            self._cache.expire()
+
 # Specialized cache classes for different data types
 class QuestionCache:
     """Specialized cache for question generation"""
@@ -273,20 +406,33 @@ class QuestionCache:
     def __init__(self, redis_manager: RedisManager):
         self.redis = redis_manager
         self.prefix = "questions"
+        self.local = LocalCache(
+            redis_manager.config.LOCAL_CACHE_MAXSIZE,
+            redis_manager.config.LOCAL_CACHE_TTL
+        )
     
     async def get_questions(self, pdf_hash: str, topic: str, count: int, mode: str) -> Optional[List[Dict]]:
         """Get cached questions"""
         key = self.redis._generate_cache_key(
             self.prefix, pdf_hash, topic or "general", count, mode
         )
-        return await self.redis.get(key)
+        questions = self.local.get(key)
+        if questions is None:
+            questions = await self.redis.get(key)
+            self.local.set(key, questions)
+        return questions
     
     async def cache_questions(self, pdf_hash: str, topic: str, count: int, mode: str, questions: List[Dict]) -> bool:
         """Cache generated questions"""
         key = self.redis._generate_cache_key(
             self.prefix, pdf_hash, topic or "general", count, mode
         )
+        self.local.set(key, questions)
         return await self.redis.set(key, questions, ttl=self.redis.config.QUESTION_CACHE_TTL)
+    
+    def invalidate(self, key: str) -> None:
+        """Drop a key from the local tier"""
+        self.local.invalidate(key)
 
 class EvaluationCache:
     """Specialized cache for answer evaluations"""
@@ -294,26 +440,67 @@ class EvaluationCache:
     def __init__(self, redis_manager: RedisManager):
         self.redis = redis_manager
         self.prefix = "evaluations"
+        self.local = LocalCache(
+            redis_manager.config.LOCAL_CACHE_MAXSIZE,
+            redis_manager.config.LOCAL_CACHE_TTL
+        )
     
     async def get_evaluation(self, question_hash: str, answer_hash: str, level: str) -> Optional[Dict]:
         """Get cached evaluation"""
         key = self.redis._generate_cache_key(
             self.prefix, question_hash, answer_hash, level
         )
-        return await self.redis.get(key)
+        evaluation = self.local.get(key)
+        if evaluation is None:
+            evaluation = await self.redis.get(key)
+            self.local.set(key, evaluation)
+        return evaluation
     
     async def cache_evaluation(self, question_hash: str, answer_hash: str, level: str, evaluation: Dict) -> bool:
         """Cache evaluation result"""
         key = self.redis._generate_cache_key(
             self.prefix, question_hash, answer_hash, level
         )
+        self.local.set(key, evaluation)
         return await self.redis.set(key, evaluation, ttl=self.redis.config.EVALUATION_CACHE_TTL)
+    
+    def invalidate(self, key: str) -> None:
+        """Drop a key from the local tier"""
+        self.local.invalidate(key)
 
 # Global Redis manager instance
 redis_manager = RedisManager()
 question_cache = QuestionCache(redis_manager)
 evaluation_cache = EvaluationCache(redis_manager)
 
+def expire_local_caches() -> None:
+    """Evict expired entries from the local cache tiers"""
+    question_cache.local.expire()
+    evaluation_cache.local.expire()
+
+async def expire_local_caches_periodically():
+    """Background task that evicts expired entries from the local cache tiers"""
+    interval = redis_manager.config.LOCAL_CACHE_EXPIRE_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        expire_local_caches()
+
+def start_local_cache_expiry_thread() -> Thread:
+    """
+    Sweep the local cache tiers from a daemon thread, for processes without a
+    long-lived event loop (Celery workers run each task under asyncio.run)
+    """
+    interval = redis_manager.config.LOCAL_CACHE_EXPIRE_INTERVAL
+    
+    def sweep():
+        while True:
+            time.sleep(interval)
+            expire_local_caches()
+    
+    thread = Thread(target=sweep, name="local-cache-expiry", daemon=True)
+    thread.start()
+    return thread
+
 # Health check function
 async def check_redis_health() -> bool:
     """Check if Redis is accessible"""
@@ -3,15 +3,46 @@ Database configuration and connection management for microservices.
 """
 
 import os
-from sqlalchemy import create_engine, pool
+import asyncio
+import math
+import time
+import threading
+import uuid
+import orjson
+from sqlalchemy import create_engine, pool, event, exc, insert, text
+from sqlalchemy.util import queue as sqla_queue
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from contextlib import contextmanager, asynccontextmanager
-from typing import Generator, AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Statements built once and reused by the connection test helpers
+_VERSION_STMT = text("SELECT version()")
+_MAINTAIN_PARTITIONS_STMT = text("SELECT maintain_partitions()")
+
+# Advisory lock key so only one worker/replica runs partition maintenance at a time
+_PARTITION_MAINTENANCE_LOCK_KEY = 7_214_530_001
+_TRY_PARTITION_LOCK_STMT = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+
+def _json_dumps(value) -> str:
+    """Serialize JSON/JSONB column values with orjson"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _unique_statement_name() -> str:
+    """Prepared statement name that cannot collide across PgBouncer server connections"""
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+# JSON/JSONB column (de)serialization shared by every engine
+_JSON_CODEC_ARGS = {
+    "json_serializer": _json_dumps,
+    "json_deserializer": orjson.loads
+}
+
 class DatabaseConfig:
     """Database configuration settings"""
     
@@ -23,23 +54,308 @@ class DatabaseConfig:
         self.DB_USER = os.getenv("DB_USER", "postgres")
         self.DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
         
+        # PgBouncer settings. When enabled, pooling is left to PgBouncer: engines
+        # open a connection per checkout (NullPool) and the POOL_* settings below are unused.
+        self.USE_PGBOUNCER = os.getenv("USE_PGBOUNCER", "0").lower() in ("1", "true")
+        self.PGBOUNCER_HOST = os.getenv("PGBOUNCER_HOST", self.DB_HOST)
+        self.PGBOUNCER_PORT = os.getenv("PGBOUNCER_PORT", "6432")
+        
+        # Read replica settings. Without DB_READ_HOST, reads use the primary engine.
+        self.DB_READ_HOST = os.getenv("DB_READ_HOST")
+        self.DB_READ_PORT = os.getenv("DB_READ_PORT", self.DB_PORT)
+        
         # Connection pool settings
         self.POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
         self.MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
         self.POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
         self.POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+        self.READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", str(self.POOL_SIZE)))
+        # Connections idle longer than this are pinged on checkout
+        self.POOL_LIVENESS_INTERVAL = int(os.getenv("DB_POOL_LIVENESS_INTERVAL", "30"))
+        # Let the sync pool resize itself between POOL_MIN_SIZE and POOL_SIZE + MAX_OVERFLOW.
+        # Opt-in: it only applies to the sync engine (the services run on the async engines)
+        # and only resizes on checkout, so an idle pool keeps its size.
+        self.POOL_AUTOSIZE = os.getenv("DB_POOL_AUTOSIZE", "false").lower() == "true"
+        self.POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+        
+        # Run asyncio code (e.g. asyncio.run() in Celery tasks) on uvloop when installed
+        self.USE_UVLOOP = os.getenv("USE_UVLOOP", "true").lower() == "true"
+        
+        # Per-connection prepared statement cache and JIT (async engine, not used with PgBouncer).
+        # JIT compilation costs more than it saves on short OLTP queries.
+        self.STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "1024"))
+        self.DISABLE_JIT = os.getenv("DB_DISABLE_JIT", "true").lower() == "true"
+        
+        # How often upcoming monthly partitions are created (seconds)
+        self.PARTITION_MAINTENANCE_INTERVAL = int(os.getenv("DB_PARTITION_MAINTENANCE_INTERVAL", "86400"))
+        
+        # Health checks fail fast instead of waiting on a slow database
+        self.HEALTH_CHECK_TIMEOUT = float(os.getenv("DB_HEALTH_CHECK_TIMEOUT", "0.5"))
+        # Separate, longer bound for creating the health-check pool (its first connect)
+        self.HEALTH_CHECK_CONNECT_TIMEOUT = float(os.getenv("DB_HEALTH_CHECK_CONNECT_TIMEOUT", "2"))
         
         # Build connection URLs
         self.DATABASE_URL = self._build_database_url()
         self.ASYNC_DATABASE_URL = self._build_async_database_url()
+        self.ASYNC_READ_DATABASE_URL = self._build_async_read_database_url()
+    
+    def _host_and_port(self) -> tuple:
+        """Host and port to connect to, PgBouncer's when enabled"""
+        if self.USE_PGBOUNCER:
+            return self.PGBOUNCER_HOST, self.PGBOUNCER_PORT
+        return self.DB_HOST, self.DB_PORT
+    
+    def _build_async_read_database_url(self):
+        """Build asynchronous read replica URL, None when no replica is configured"""
+        if not self.DB_READ_HOST:
+            return None
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_READ_HOST}:{self.DB_READ_PORT}/{self.DB_NAME}"
+    
+    def asyncpg_connect_args(self) -> dict:
+        """asyncpg connection arguments shared by the async engine and the raw pool"""
+        if self.USE_PGBOUNCER:
+            # Prepared statements and startup settings break under transaction pooling.
+            # Without a statement cache asyncpg only uses unnamed statements.
+            return {"statement_cache_size": 0}
+        connect_args = {"statement_cache_size": self.STATEMENT_CACHE_SIZE}
+        if self.DISABLE_JIT:
+            connect_args["server_settings"] = {"jit": "off"}
+        return connect_args
+    
+    def async_engine_connect_args(self) -> dict:
+        """connect_args for SQLAlchemy async engines (asyncpg arguments plus dialect options)"""
+        connect_args = self.asyncpg_connect_args()
+        if self.USE_PGBOUNCER:
+            # SQLAlchemy prepares named statements itself; sequential names would
+            # collide once PgBouncer moves a client to another server connection
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = _unique_statement_name
+        else:
+            # SQLAlchemy's own per-connection cache of asyncpg prepared statements
+            connect_args["prepared_statement_cache_size"] = self.STATEMENT_CACHE_SIZE
+        return connect_args
     
     def _build_database_url(self) -> str:
         """Build synchronous database URL"""
-        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        host, port = self._host_and_port()
+        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{host}:{port}/{self.DB_NAME}"
     
     def _build_async_database_url(self) -> str:
         """Build asynchronous database URL"""
-        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        host, port = self._host_and_port()
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{host}:{port}/{self.DB_NAME}"
+
+def install_uvloop() -> bool:
+    """Make new asyncio event loops use uvloop, if it is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not installed, using the default asyncio event loop")
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+def _install_liveness_check(engine, liveness_interval: int) -> None:
+    """
+    Ping pooled connections on checkout only when they have been idle longer
+    than liveness_interval seconds, instead of on every checkout (pool_pre_ping).
+    A failed ping raises DisconnectionError so the pool retries with a fresh connection.
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+    
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+    
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        last_used = connection_record.info.get("last_used", 0.0)
+        if time.monotonic() - last_used <= liveness_interval:
+            return
+        
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as e:
+            logger.warning(f"Stale pooled connection detected, reconnecting: {e}")
+            raise exc.DisconnectionError() from e
+        finally:
+            cursor.close()
+
+class AutoSizingQueuePool(pool.QueuePool):
+    """
+    QueuePool that resizes itself to the observed load.
+    
+    Checked-out connections are modelled as Poisson distributed (M/M/inf
+    occupancy) with a mean tracked by an EMA. About once a second the pool
+    size is set to the smallest n for which P(checked_out > n) is below
+    1 / (overflow_interval * checkout_rate), i.e. roughly one checkout per
+    overflow_interval seconds has to open an overflow connection.
+    pool_size + max_overflow stays the hard ceiling on total connections.
+    """
+    
+    _IN_USE_DECAY = 0.05  # Per checkout/checkin event
+    _RATE_DECAY = 0.5  # Per resize interval
+    
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10,
+                 pool_min_size: int = 1, overflow_interval: float = 60.0,
+                 resize_interval: float = 1.0, **kw):
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kw)
+        # Unlimited overflow (-1) leaves nothing to size against
+        self._ceiling = pool_size + max_overflow if max_overflow >= 0 else None
+        # Queue maxsize 0 means unbounded, so never go below 1
+        self._min_size = max(1, min(pool_min_size, pool_size))
+        self._overflow_interval = overflow_interval
+        self._resize_interval = resize_interval
+        
+        self._stats_lock = threading.Lock()
+        self._in_use = 0
+        self._in_use_ema = 0.0
+        self._checkouts = 0
+        self._rate_ema = 0.0
+        self._last_resize = time.monotonic()
+    
+    def _do_get(self):
+        record = super()._do_get()
+        with self._stats_lock:
+            self._in_use += 1
+            self._in_use_ema += self._IN_USE_DECAY * (self._in_use - self._in_use_ema)
+            self._checkouts += 1
+            self._maybe_resize()
+        return record
+    
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        with self._stats_lock:
+            self._in_use = max(0, self._in_use - 1)
+            self._in_use_ema += self._IN_USE_DECAY * (self._in_use - self._in_use_ema)
+    
+    def _maybe_resize(self) -> None:
+        """Update the checkout rate and resize once per resize_interval (stats lock held)"""
+        if self._ceiling is None:
+            return
+        now = time.monotonic()
+        elapsed = now - self._last_resize
+        if elapsed < self._resize_interval:
+            return
+        
+        rate = self._checkouts / elapsed
+        self._rate_ema += self._RATE_DECAY * (rate - self._rate_ema)
+        self._checkouts = 0
+        self._last_resize = now
+        
+        target = self._target_size()
+        if target != self._pool.maxsize:
+            self._resize(target)
+    
+    def _target_size(self) -> int:
+        """Smallest size whose Poisson tail probability is below the overflow budget"""
+        if self._rate_ema <= 0:
+            return self._min_size
+        
+        mean = self._in_use_ema
+        budget = min(1.0, 1.0 / (self._overflow_interval * self._rate_ema))
+        
+        term = math.exp(-mean)
+        cdf = term
+        size = 0
+        while 1.0 - cdf >= budget and size < self._ceiling:
+            size += 1
+            term *= mean / size
+            cdf += term
+        return max(self._min_size, min(size, self._ceiling))
+    
+    def _resize(self, new_size: int) -> None:
+        """Change the pool size, keeping total connections under the ceiling"""
+        surplus = []
+        with self._overflow_lock:
+            old_size = self._pool.maxsize
+            self._pool.maxsize = new_size
+            # _overflow counts connections relative to the pool size
+            self._overflow += old_size - new_size
+            self._max_overflow = self._ceiling - new_size
+            # The queue only reports Full at exactly maxsize, so idle connections
+            # above the new size have to be taken out here or they are never closed
+            while self._pool.qsize() > new_size:
+                try:
+                    surplus.append(self._pool.get(block=False))
+                except sqla_queue.Empty:
+                    break
+                self._overflow -= 1
+        
+        for record in surplus:
+            record.close()
+        logger.debug(f"Resized database pool {old_size} -> {new_size}, closed {len(surplus)} idle connections")
+    
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool._min_size = self._min_size
+        new_pool._overflow_interval = self._overflow_interval
+        new_pool._resize_interval = self._resize_interval
+        return new_pool
+
+class _SessionContext:
+    """
+    Session context manager: commit on success, rollback on error, always close.
+    A plain class is cheaper per request than a @contextmanager generator.
+    """
+    __slots__ = ("_factory", "_session")
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._session = None
+    
+    def __enter__(self) -> Session:
+        self._session = self._factory()
+        return self._session
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        session = self._session
+        try:
+            if exc_type is None:
+                try:
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    logger.error(f"Database session error: {e}")
+                    raise
+            elif issubclass(exc_type, Exception):
+                session.rollback()
+                logger.error(f"Database session error: {exc_value}")
+        finally:
+            session.close()
+        return False
+
+class _AsyncSessionContext:
+    """Async counterpart of _SessionContext"""
+    __slots__ = ("_factory", "_session")
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._session = None
+    
+    async def __aenter__(self) -> AsyncSession:
+        self._session = self._factory()
+        return self._session
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> bool:
+        session = self._session
+        try:
+            if exc_type is None:
+                try:
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    logger.error(f"Async database session error: {e}")
+                    raise
+            elif issubclass(exc_type, Exception):
+                await session.rollback()
+                logger.error(f"Async database session error: {exc_value}")
+        finally:
+            await session.close()
+        return False
 
 class DatabaseManager:
     """Database connection manager with connection pooling"""
@@ -50,45 +366,170 @@ class DatabaseManager:
         self._async_engine = None
         self._session_factory = None
         self._async_session_factory = None
+        self._async_read_engine = None
+        self._async_read_session_factory = None
+        self._asyncpg_pool = None
+        self._asyncpg_pool_lock = asyncio.Lock()
+        
+        if self.config.USE_UVLOOP:
+            install_uvloop()
+        
+        if os.getenv("EAGER_INIT", "0").lower() in ("1", "true"):
+            self.init_session_factories()
         
     def get_engine(self):
         """Get or create synchronous database engine"""
         if self._engine is None:
+            echo = os.getenv("DB_ECHO", "false").lower() == "true"
+            if self.config.USE_PGBOUNCER:
+                self._engine = create_engine(
+                    self.config.DATABASE_URL,
+                    poolclass=pool.NullPool,
+                    echo=echo,
+                    **_JSON_CODEC_ARGS
+                )
+                logger.info("Created database engine without pooling (PgBouncer)")
+                return self._engine
+            
+            if self.config.POOL_AUTOSIZE:
+                pool_args = {
+                    "poolclass": AutoSizingQueuePool,
+                    "pool_min_size": self.config.POOL_MIN_SIZE
+                }
+            else:
+                pool_args = {"poolclass": pool.QueuePool}
+            
             self._engine = create_engine(
                 self.config.DATABASE_URL,
-                poolclass=pool.QueuePool,
                 pool_size=self.config.POOL_SIZE,
                 max_overflow=self.config.MAX_OVERFLOW,
                 pool_timeout=self.config.POOL_TIMEOUT,
                 pool_recycle=self.config.POOL_RECYCLE,
-                pool_pre_ping=True,  # Validate connections before use
-                echo=os.getenv("DB_ECHO", "false").lower() == "true"
+                echo=echo,
+                **pool_args,
+                **_JSON_CODEC_ARGS
             )
+            # Validate connections before use, but only after they sat idle
+            _install_liveness_check(self._engine, self.config.POOL_LIVENESS_INTERVAL)
             logger.info(f"Created database engine with pool_size={self.config.POOL_SIZE}")
         return self._engine
     
+    def _create_async_engine(self, url: str, pool_size: int, label: str, read_only: bool = False):
+        """Create an async engine with the shared pooling and driver settings"""
+        echo = os.getenv("DB_ECHO", "false").lower() == "true"
+        if self.config.USE_PGBOUNCER:
+            engine = create_async_engine(
+                url,
+                poolclass=pool.NullPool,
+                connect_args=self.config.async_engine_connect_args(),
+                echo=echo,
+                **_JSON_CODEC_ARGS
+            )
+            logger.info(f"Created {label} without pooling (PgBouncer)")
+            return engine
+        
+        engine = create_async_engine(
+            url,
+            pool_size=pool_size,
+            max_overflow=self.config.MAX_OVERFLOW,
+            pool_timeout=self.config.POOL_TIMEOUT,
+            pool_recycle=self.config.POOL_RECYCLE,
+            # Sessions always end their transaction before releasing the connection,
+            # so read-only engines skip the extra ROLLBACK on checkin
+            pool_reset_on_return=None if read_only else "rollback",
+            connect_args=self.config.async_engine_connect_args(),
+            echo=echo,
+            **_JSON_CODEC_ARGS
+        )
+        _install_liveness_check(engine.sync_engine, self.config.POOL_LIVENESS_INTERVAL)
+        logger.info(f"Created {label} with pool_size={pool_size}")
+        return engine
+    
     def get_async_engine(self):
         """Get or create asynchronous database engine"""
         if self._async_engine is None:
-            self._async_engine = create_async_engine(
+            self._async_engine = self._create_async_engine(
                 self.config.ASYNC_DATABASE_URL,
-                pool_size=self.config.POOL_SIZE,
-                max_overflow=self.config.MAX_OVERFLOW,
-                pool_timeout=self.config.POOL_TIMEOUT,
-                pool_recycle=self.config.POOL_RECYCLE,
-                pool_pre_ping=True,
-                echo=os.getenv("DB_ECHO", "false").lower() == "true"
+                self.config.POOL_SIZE,
+                "async database engine"
             )
-            logger.info(f"Created async database engine with pool_size={self.config.POOL_SIZE}")
         return self._async_engine
     
+    def get_async_read_engine(self):
+        """Get or create the async engine for the read replica (the primary if none is configured)"""
+        if self._async_read_engine is None:
+            if self.config.ASYNC_READ_DATABASE_URL is None:
+                self._async_read_engine = self.get_async_engine()
+            else:
+                self._async_read_engine = self._create_async_engine(
+                    self.config.ASYNC_READ_DATABASE_URL,
+                    self.config.READ_POOL_SIZE,
+                    "async read replica engine",
+                    read_only=True
+                )
+        return self._async_read_engine
+    
+    async def get_asyncpg_pool(self):
+        """
+        Get or create a raw asyncpg pool for short hot queries (health checks)
+        that do not need SQLAlchemy sessions or the ORM
+        """
+        if self._asyncpg_pool is None:
+            async with self._asyncpg_pool_lock:
+                if self._asyncpg_pool is None:
+                    import asyncpg
+                    # Goes through PgBouncer when enabled, with the same statement settings
+                    host, port = self.config._host_and_port()
+                    self._asyncpg_pool = await asyncpg.create_pool(
+                        host=host,
+                        port=int(port),
+                        user=self.config.DB_USER,
+                        password=self.config.DB_PASSWORD,
+                        database=self.config.DB_NAME,
+                        min_size=1,
+                        max_size=self.config.POOL_SIZE,
+                        command_timeout=5,
+                        # Connect timeout, asyncpg's default of 60s would stall health checks
+                        timeout=self.config.HEALTH_CHECK_CONNECT_TIMEOUT,
+                        **self.config.asyncpg_connect_args()
+                    )
+                    logger.info(f"Created asyncpg pool with max_size={self.config.POOL_SIZE}")
+        return self._asyncpg_pool
+    
+    async def warmup_pool(self, n: Optional[int] = None) -> None:
+        """
+        Open up to n (default POOL_SIZE) async connections at once and return
+        them to the pool, so the first burst of requests finds them ready.
+        """
+        if self.config.USE_PGBOUNCER:
+            return  # NullPool keeps nothing to warm up
+        count = min(n or self.config.POOL_SIZE, self.config.POOL_SIZE)
+        engines = [self.get_async_engine()]
+        if self.get_async_read_engine() is not engines[0]:
+            engines.append(self.get_async_read_engine())
+        
+        for engine in engines:
+            results = await asyncio.gather(
+                *(engine.connect() for _ in range(count)), return_exceptions=True
+            )
+            errors = [r for r in results if isinstance(r, BaseException)]
+            for connection in results:
+                if not isinstance(connection, BaseException):
+                    await connection.close()
+            if errors:
+                logger.warning(f"Pool warmup opened {count - len(errors)}/{count} connections: {errors[0]!r}")
+            else:
+                logger.info(f"Warmed up {count} pooled connections")
+    
     def get_session_factory(self):
         """Get or create session factory"""
         if self._session_factory is None:
             self._session_factory = sessionmaker(
                 bind=self.get_engine(),
                 autocommit=False,
-                autoflush=False
+                autoflush=False,
+                # Objects stay loaded after commit instead of being re-selected on next access
+                expire_on_commit=False
             )
         return self._session_factory
     
@@ -99,43 +540,60 @@ class DatabaseManager:
                 bind=self.get_async_engine(),
                 class_=AsyncSession,
                 autocommit=False,
-                autoflush=False
+                autoflush=False,
+                # Objects stay loaded after commit instead of being re-selected on next access
+                expire_on_commit=False
             )
         return self._async_session_factory
     
-    @contextmanager
-    def get_session(self) -> Generator[Session, None, None]:
+    def get_async_read_session_factory(self):
+        """Get or create async session factory bound to the read replica"""
+        if self._async_read_session_factory is None:
+            self._async_read_session_factory = async_sessionmaker(
+                bind=self.get_async_read_engine(),
+                class_=AsyncSession,
+                autocommit=False,
+                autoflush=False,
+                # Nothing is written, so loaded objects stay usable after the session closes
+                expire_on_commit=False
+            )
+        return self._async_read_session_factory
+    
+    def init_session_factories(self) -> None:
+        """
+        Create the async engines and session factories up front so no request pays
+        for it. The sync factory stays lazy: its engine imports a sync driver the
+        async-only services do not ship.
+        """
+        self.get_async_session_factory()
+        self.get_async_read_session_factory()
+    
+    def get_session(self) -> "_SessionContext":
         """Get a database session with automatic cleanup"""
-        session = self.get_session_factory()()
-        try:
-            yield session
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Database session error: {e}")
-            raise
-        finally:
-            session.close()
+        return _SessionContext(self._session_factory or self.get_session_factory())
     
-    @asynccontextmanager
-    async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
+    def get_async_session(self) -> "_AsyncSessionContext":
         """Get an async database session with automatic cleanup"""
-        session = self.get_async_session_factory()()
-        try:
-            yield session
-            await session.commit()
-        except Exception as e:
-            await session.rollback()
-            logger.error(f"Async database session error: {e}")
-            raise
-        finally:
-            await session.close()
+        return _AsyncSessionContext(self._async_session_factory or self.get_async_session_factory())
+    
+    def get_async_read_session(self) -> "_AsyncSessionContext":
+        """Get an async session on the read replica, for read-only work"""
+        return _AsyncSessionContext(
+            self._async_read_session_factory or self.get_async_read_session_factory()
+        )
     
     async def close_async_engine(self):
         """Close the async engine and all connections"""
+        if self._async_read_engine is not None and self._async_read_engine is not self._async_engine:
+            await self._async_read_engine.dispose()
+            logger.info("Closed async read replica engine")
         if self._async_engine:
             await self._async_engine.dispose()
             logger.info("Closed async database engine")
+        if self._asyncpg_pool:
+            await self._asyncpg_pool.close()
+            self._asyncpg_pool = None
+            logger.info("Closed asyncpg pool")
     
     def close_engine(self):
         """Close the sync engine and all connections"""
@@ -157,6 +615,36 @@ async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with db_manager.get_async_session() as session:
         yield session
 
+async def get_async_read_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency function for FastAPI to get a read-only async session on the replica"""
+    async with db_manager.get_async_read_session() as session:
+        yield session
+
+# Bulk write helpers
+async def bulk_insert_chat_messages(session: AsyncSession, messages: List[Dict[str, Any]]) -> None:
+    """Insert chat messages with one executemany on the session.
+
+    A Core insert() with a list of parameter sets runs through asyncpg's
+    executemany inside the session's transaction, so the rows commit or roll
+    back with the session. Ids come from the column default, timestamps from
+    the database.
+    """
+    if not messages:
+        return
+    from .models import ChatMessage
+
+    rows = [
+        {
+            "session_id": message["session_id"],
+            "message_type": message["message_type"],
+            "content": message["content"],
+            "ai_model": message.get("ai_model"),
+            "response_time": message.get("response_time")
+        }
+        for message in messages
+    ]
+    await session.execute(insert(ChatMessage), rows)
+
 # Database initialization functions
 def create_tables():
     """Create all database tables"""
@@ -180,15 +668,46 @@ def drop_tables():
     Base.metadata.drop_all(bind=engine)
     logger.warning("Dropped all database tables")
 
+async def maintain_partitions_periodically():
+    """Background task that creates upcoming monthly partitions (see init.sql)
+    
+    Every service worker runs this loop; a transaction-scoped advisory lock
+    (released on commit, so it is safe behind PgBouncer) lets only one of them
+    do the work per round.
+    """
+    interval = db_manager.config.PARTITION_MAINTENANCE_INTERVAL
+    while True:
+        try:
+            async with db_manager.get_async_session() as session:
+                acquired = await session.scalar(
+                    _TRY_PARTITION_LOCK_STMT, {"key": _PARTITION_MAINTENANCE_LOCK_KEY}
+                )
+                if acquired:
+                    await session.execute(_MAINTAIN_PARTITIONS_STMT)
+                else:
+                    logger.debug("Partition maintenance already running elsewhere, skipping")
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {e}")
+        await asyncio.sleep(interval)
+
 # Health check function
+async def _ping_database(pool) -> None:
+    """Protocol-level ping on a raw asyncpg connection, bypassing SQLAlchemy"""
+    async with pool.acquire() as conn:
+        # An empty query is a full round-trip with nothing to parse or plan
+        await conn.execute("")
+
 async def check_database_health() -> bool:
     """Check if database is accessible"""
     try:
-        async with db_manager.get_async_session() as session:
-            result = await session.execute("SELECT 1")
-            return result.scalar() == 1
+        config = db_manager.config
+        # Pool creation (and its first connect) has its own bound, not the ping's.
+        # An unreachable database fails here quickly instead of after asyncpg's 60s.
+        pool = await asyncio.wait_for(db_manager.get_asyncpg_pool(), timeout=config.HEALTH_CHECK_CONNECT_TIMEOUT)
+        await asyncio.wait_for(_ping_database(pool), timeout=config.HEALTH_CHECK_TIMEOUT)
+        return True
     except Exception as e:
-        logger.error(f"Database health check failed: {e}")
+        logger.error(f"Database health check failed: {e!r}")
         return False
 
 # Migration support
@@ -220,7 +739,7 @@ def test_connection():
     """Test database connection"""
     try:
         with db_manager.get_session() as session:
-            result = session.execute("SELECT version()")
+            result = session.execute(_VERSION_STMT)
             version = result.scalar()
             logger.info(f"Database connection successful. PostgreSQL version: {version}")
             return True
@@ -232,7 +751,7 @@ async def test_async_connection():
     """Test async database connection"""
     try:
         async with db_manager.get_async_session() as session:
-            result = await session.execute("SELECT version()")
+            result = await session.execute(_VERSION_STMT)
             version = result.scalar()
             logger.info(f"Async database connection successful. PostgreSQL version: {version}")
             return True
@@ -5,12 +5,11 @@
 -- CREATE DATABASE learning_app;
 -- \c learning_app;
 
--- Enable UUID extension
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- UUID ids use the built-in gen_random_uuid() (PostgreSQL 13+), no extension needed
 
 -- Create users table
 CREATE TABLE IF NOT EXISTS users (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     username VARCHAR(50) UNIQUE NOT NULL,
     email VARCHAR(100) UNIQUE,
     password_hash VARCHAR(255) NOT NULL,
@@ -21,10 +20,10 @@ CREATE TABLE IF NOT EXISTS users (
 
 -- Create user sessions table
 CREATE TABLE IF NOT EXISTS user_sessions (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
-    user_id VARCHAR NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     session_token VARCHAR(255) UNIQUE NOT NULL,
-    ip_address VARCHAR(45),
+    ip_address INET,
     user_agent TEXT,
     expires_at TIMESTAMP NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -32,8 +31,8 @@ CREATE TABLE IF NOT EXISTS user_sessions (
 
 -- Create PDFs table
 CREATE TABLE IF NOT EXISTS pdfs (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
-    user_id VARCHAR NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     filename VARCHAR(255) NOT NULL,
     original_filename VARCHAR(255) NOT NULL,
     file_path VARCHAR(500) NOT NULL,
@@ -51,8 +50,8 @@ CREATE TABLE IF NOT EXISTS pdfs (
 
 -- Create PDF extracted text table
 CREATE TABLE IF NOT EXISTS pdf_extracted_text (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
-    pdf_id VARCHAR NOT NULL REFERENCES pdfs(id) ON DELETE CASCADE UNIQUE,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    pdf_id UUID NOT NULL REFERENCES pdfs(id) ON DELETE CASCADE UNIQUE,
     extracted_text TEXT NOT NULL,
     text_length INTEGER NOT NULL,
     extraction_method VARCHAR(50) NOT NULL,
@@ -61,8 +60,8 @@ CREATE TABLE IF NOT EXISTS pdf_extracted_text (
 
 -- Create questions table
 CREATE TABLE IF NOT EXISTS questions (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
-    pdf_id VARCHAR NOT NULL REFERENCES pdfs(id) ON DELETE CASCADE,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    pdf_id UUID NOT NULL REFERENCES pdfs(id) ON DELETE CASCADE,
     question_set_id VARCHAR NOT NULL,
     question_text TEXT NOT NULL,
     question_type VARCHAR(20) NOT NULL CHECK (question_type IN ('mcq', 'open_ended')),
@@ -77,34 +76,35 @@ CREATE TABLE IF NOT EXISTS questions (
 
 -- Create chat sessions table
 CREATE TABLE IF NOT EXISTS chat_sessions (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
-    user_id VARCHAR NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    pdf_id VARCHAR NOT NULL REFERENCES pdfs(id) ON DELETE CASCADE,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    pdf_id UUID NOT NULL REFERENCES pdfs(id) ON DELETE CASCADE,
     session_name VARCHAR(255),
     is_active BOOLEAN DEFAULT TRUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- Create chat messages table
+-- Create chat messages table (partitioned by month, see create_monthly_partitions below)
 CREATE TABLE IF NOT EXISTS chat_messages (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
-    session_id VARCHAR NOT NULL REFERENCES chat_sessions(id) ON DELETE CASCADE,
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    session_id UUID NOT NULL REFERENCES chat_sessions(id) ON DELETE CASCADE,
     message_type VARCHAR(20) NOT NULL CHECK (message_type IN ('user', 'assistant')),
     content TEXT NOT NULL,
-    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     ai_model VARCHAR(50),
-    response_time FLOAT
-);
+    response_time FLOAT,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
--- Create evaluations table
+-- Create evaluations table (partitioned by month)
 CREATE TABLE IF NOT EXISTS evaluations (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
-    user_id VARCHAR NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    question_id VARCHAR NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    question_id UUID NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
     user_answer TEXT NOT NULL,
-    score INTEGER NOT NULL CHECK (score >= 0 AND score <= 10),
-    max_score INTEGER DEFAULT 10,
+    score SMALLINT NOT NULL CHECK (score >= 0 AND score <= 10),
+    max_score SMALLINT DEFAULT 10,
     feedback TEXT,
     suggestions TEXT,
     correct_answer_hint TEXT,
@@ -112,20 +112,21 @@ CREATE TABLE IF NOT EXISTS evaluations (
     evaluation_time FLOAT,
     ai_model VARCHAR(50),
     cache_hit BOOLEAN DEFAULT FALSE,
-    evaluated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    evaluated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, evaluated_at)
+) PARTITION BY RANGE (evaluated_at);
 
 -- Create quiz sessions table
 CREATE TABLE IF NOT EXISTS quiz_sessions (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
-    user_id VARCHAR NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    pdf_id VARCHAR NOT NULL REFERENCES pdfs(id) ON DELETE CASCADE,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    pdf_id UUID NOT NULL REFERENCES pdfs(id) ON DELETE CASCADE,
     question_set_id VARCHAR NOT NULL,
     topic VARCHAR(255),
     total_questions INTEGER NOT NULL,
     evaluation_level VARCHAR(20) NOT NULL,
-    total_score INTEGER NOT NULL,
-    max_score INTEGER NOT NULL,
+    total_score SMALLINT NOT NULL,
+    max_score SMALLINT NOT NULL,
     percentage FLOAT NOT NULL,
     grade VARCHAR(2) NOT NULL,
     overall_feedback TEXT,
@@ -138,7 +139,7 @@ CREATE TABLE IF NOT EXISTS quiz_sessions (
 
 -- Create cache entries table
 CREATE TABLE IF NOT EXISTS cache_entries (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     cache_key VARCHAR(255) UNIQUE NOT NULL,
     cache_type VARCHAR(50) NOT NULL,
     data JSONB NOT NULL,
@@ -148,22 +149,57 @@ CREATE TABLE IF NOT EXISTS cache_entries (
     access_count INTEGER DEFAULT 1
 );
 
--- Create background jobs table
+-- Create background jobs table (partitioned by month)
 CREATE TABLE IF NOT EXISTS background_jobs (
-    id VARCHAR PRIMARY KEY DEFAULT uuid_generate_v4()::text,
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     job_type VARCHAR(50) NOT NULL,
     status VARCHAR(20) NOT NULL CHECK (status IN ('pending', 'running', 'completed', 'failed')),
-    user_id VARCHAR NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     parameters JSONB NOT NULL,
     result JSONB,
     error_message TEXT,
-    progress_percentage INTEGER DEFAULT 0 CHECK (progress_percentage >= 0 AND progress_percentage <= 100),
+    progress_percentage SMALLINT DEFAULT 0 CHECK (progress_percentage >= 0 AND progress_percentage <= 100),
     progress_message VARCHAR(255),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     started_at TIMESTAMP,
     completed_at TIMESTAMP,
-    celery_task_id VARCHAR(255)
-);
+    celery_task_id VARCHAR(255),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Create monthly partitions of a range-partitioned table, from the current
+-- month up to months_ahead months ahead, plus a default partition as a catch-all.
+-- Must run at least every months_ahead months: a month's partition cannot be
+-- created once rows for that month have landed in the default partition.
+-- models.py runs the same DDL after metadata.create_all(), keep both in sync.
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent_table TEXT, months_ahead INTEGER DEFAULT 2)
+RETURNS VOID AS $$
+DECLARE
+    month_start DATE;
+BEGIN
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT',
+                   parent_table || '_default', parent_table);
+    
+    FOR i IN 0..months_ahead LOOP
+        month_start := (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::DATE;
+        EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                       parent_table || '_' || to_char(month_start, 'YYYY_MM'), parent_table,
+                       month_start, (month_start + INTERVAL '1 month')::DATE);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create upcoming partitions for every partitioned table (run periodically)
+CREATE OR REPLACE FUNCTION maintain_partitions()
+RETURNS VOID AS $$
+BEGIN
+    PERFORM create_monthly_partitions('chat_messages');
+    PERFORM create_monthly_partitions('evaluations');
+    PERFORM create_monthly_partitions('background_jobs');
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT maintain_partitions();
 
 -- Create indexes for performance optimization
 
@@ -232,6 +268,10 @@ CREATE INDEX IF NOT EXISTS idx_questions_pdf_topic ON questions(pdf_id, topic);
 CREATE INDEX IF NOT EXISTS idx_evaluations_user_question ON evaluations(user_id, question_id);
 CREATE INDEX IF NOT EXISTS idx_chat_messages_session_time ON chat_messages(session_id, timestamp);
 CREATE INDEX IF NOT EXISTS idx_quiz_sessions_user_completed ON quiz_sessions(user_id, completed_at);
+CREATE INDEX IF NOT EXISTS idx_questions_pdf_set ON questions(pdf_id, question_set_id);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_key_type ON cache_entries(cache_key, cache_type) INCLUDE (expires_at);
+CREATE INDEX IF NOT EXISTS idx_background_jobs_status_type ON background_jobs(status, job_type)
+    WHERE status IN ('pending', 'running');
 
 -- Create triggers for updated_at timestamps
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -264,7 +304,7 @@ END;
 $$ LANGUAGE plpgsql;
 
 -- Create function to get user statistics
-CREATE OR REPLACE FUNCTION get_user_stats(user_uuid VARCHAR)
+CREATE OR REPLACE FUNCTION get_user_stats(user_uuid UUID)
 RETURNS TABLE(
     total_pdfs INTEGER,
     total_questions INTEGER,
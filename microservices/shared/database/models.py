@@ -3,251 +3,354 @@ Shared database models for the Learning App microservices architecture.
 These models define the database schema for all services.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Float
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from __future__ import annotations
+
+from sqlalchemy import DDL, Integer, SmallInteger, String, Text, DateTime, Boolean, ForeignKey, Float, Index, event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
+from typing import Any, List, Optional
 import uuid
 
-Base = declarative_base()
+class Base(DeclarativeBase):
+    """Declarative base shared by all models"""
+
+def parse_uuid(value: Any) -> Optional[str]:
+    """
+    Canonical string form of a client-supplied id, or None if it is not a UUID.
+    Ids are native UUID columns, so malformed input has to be caught before it
+    reaches the database (where it raises a DataError).
+    """
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+def _uuid_primary_key() -> Mapped[str]:
+    """
+    UUID primary key generated client side, so multi-row flushes are sent as one
+    batched INSERT with the id as insert sentinel instead of one INSERT ... RETURNING
+    per row. gen_random_uuid() stays as the DDL default for raw SQL inserts.
+    """
+    return mapped_column(
+        postgresql.UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4()),
+        server_default=text("gen_random_uuid()"),
+        insert_sentinel=True
+    )
 
 class User(Base):
     """User model for authentication and session management"""
     __tablename__ = "users"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    username = Column(String(50), unique=True, nullable=False)
-    email = Column(String(100), unique=True, nullable=True)
-    password_hash = Column(String(255), nullable=False)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    id: Mapped[str] = _uuid_primary_key()
+    username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    email: Mapped[Optional[str]] = mapped_column(String(100), unique=True, nullable=True)
+    password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    sessions = relationship("UserSession", back_populates="user")
-    pdfs = relationship("PDF", back_populates="user")
-    chat_sessions = relationship("ChatSession", back_populates="user")
+    sessions: Mapped[List[UserSession]] = relationship(back_populates="user")
+    pdfs: Mapped[List[PDF]] = relationship(back_populates="user")
+    chat_sessions: Mapped[List[ChatSession]] = relationship(back_populates="user")
 
 class UserSession(Base):
     """User session model for authentication tracking"""
     __tablename__ = "user_sessions"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    session_token = Column(String(255), unique=True, nullable=False)
-    ip_address = Column(String(45), nullable=True)
-    user_agent = Column(Text, nullable=True)
-    expires_at = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=func.now())
+    id: Mapped[str] = _uuid_primary_key()
+    user_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    session_token: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    ip_address: Mapped[Optional[str]] = mapped_column(postgresql.INET, nullable=True)
+    user_agent: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="sessions")
+    user: Mapped[User] = relationship(back_populates="sessions")
 
 class PDF(Base):
     """PDF document model"""
     __tablename__ = "pdfs"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    filename = Column(String(255), nullable=False)
-    original_filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
-    file_size = Column(Integer, nullable=False)
-    content_hash = Column(String(64), nullable=False, index=True)  # For caching
+    id: Mapped[str] = _uuid_primary_key()
+    user_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    file_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)  # For caching
     
     # Metadata
-    title = Column(String(500), nullable=True)
-    author = Column(String(255), nullable=True)
-    subject = Column(String(500), nullable=True)
-    pages = Column(Integer, nullable=True)
+    title: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    author: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    subject: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    pages: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     
     # Processing status
-    is_processed = Column(Boolean, default=False)
-    processing_error = Column(Text, nullable=True)
+    is_processed: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    processing_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Timestamps
-    uploaded_at = Column(DateTime, default=func.now())
-    processed_at = Column(DateTime, nullable=True)
+    uploaded_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Relationships
-    user = relationship("User", back_populates="pdfs")
-    extracted_text = relationship("PDFExtractedText", back_populates="pdf", uselist=False)
-    questions = relationship("Question", back_populates="pdf")
-    chat_sessions = relationship("ChatSession", back_populates="pdf")
+    user: Mapped[User] = relationship(back_populates="pdfs")
+    extracted_text: Mapped[Optional[PDFExtractedText]] = relationship(back_populates="pdf")
+    questions: Mapped[List[Question]] = relationship(back_populates="pdf")
+    chat_sessions: Mapped[List[ChatSession]] = relationship(back_populates="pdf")
 
 class PDFExtractedText(Base):
     """Extracted text content from PDFs with caching"""
     __tablename__ = "pdf_extracted_text"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    pdf_id = Column(String, ForeignKey("pdfs.id"), nullable=False, unique=True)
-    extracted_text = Column(Text, nullable=False)
-    text_length = Column(Integer, nullable=False)
-    extraction_method = Column(String(50), nullable=False)  # 'pypdf2' or 'pdfplumber'
-    extracted_at = Column(DateTime, default=func.now())
+    id: Mapped[str] = _uuid_primary_key()
+    pdf_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("pdfs.id"), nullable=False, unique=True)
+    extracted_text: Mapped[str] = mapped_column(Text, nullable=False)
+    text_length: Mapped[int] = mapped_column(Integer, nullable=False)
+    extraction_method: Mapped[str] = mapped_column(String(50), nullable=False)  # 'pypdf2' or 'pdfplumber'
+    extracted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
     
     # Relationships
-    pdf = relationship("PDF", back_populates="extracted_text")
+    pdf: Mapped[PDF] = relationship(back_populates="extracted_text")
 
 class Question(Base):
     """Generated questions from PDFs"""
     __tablename__ = "questions"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    pdf_id = Column(String, ForeignKey("pdfs.id"), nullable=False)
-    question_set_id = Column(String, nullable=False, index=True)  # Groups questions from same generation
+    id: Mapped[str] = _uuid_primary_key()
+    pdf_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("pdfs.id"), nullable=False)
+    question_set_id: Mapped[str] = mapped_column(String, nullable=False, index=True)  # Groups questions from same generation
     
     # Question content
-    question_text = Column(Text, nullable=False)
-    question_type = Column(String(20), nullable=False)  # 'mcq' or 'open_ended'
-    topic = Column(String(255), nullable=True)
-    difficulty_level = Column(String(20), nullable=True)  # 'easy', 'medium', 'hard'
+    question_text: Mapped[str] = mapped_column(Text, nullable=False)
+    question_type: Mapped[str] = mapped_column(String(20), nullable=False)  # 'mcq' or 'open_ended'
+    topic: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    difficulty_level: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # 'easy', 'medium', 'hard'
     
     # MCQ specific fields
-    options = Column(JSON, nullable=True)  # Array of options for MCQ
-    correct_answer = Column(String(10), nullable=True)  # 'A', 'B', 'C', 'D' for MCQ
+    options: Mapped[Optional[Any]] = mapped_column(postgresql.JSONB, nullable=True)  # Array of options for MCQ
+    correct_answer: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)  # 'A', 'B', 'C', 'D' for MCQ
     
     # Generation metadata
-    generation_parameters = Column(JSON, nullable=True)  # Store generation params for caching
-    cache_key = Column(String(64), nullable=False, index=True)  # For caching identical requests
+    generation_parameters: Mapped[Optional[Any]] = mapped_column(postgresql.JSONB, nullable=True)  # Store generation params for caching
+    cache_key: Mapped[str] = mapped_column(String(64), nullable=False, index=True)  # For caching identical requests
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
     
     # Relationships
-    pdf = relationship("PDF", back_populates="questions")
-    evaluations = relationship("Evaluation", back_populates="question")
+    pdf: Mapped[PDF] = relationship(back_populates="questions")
+    evaluations: Mapped[List[Evaluation]] = relationship(back_populates="question")
+    
+    __table_args__ = (
+        # Questions of one generation run for a PDF
+        Index("idx_questions_pdf_set", "pdf_id", "question_set_id"),
+    )
 
 class ChatSession(Base):
     """Chat sessions between users and AI"""
     __tablename__ = "chat_sessions"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    pdf_id = Column(String, ForeignKey("pdfs.id"), nullable=False)
-    session_name = Column(String(255), nullable=True)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    id: Mapped[str] = _uuid_primary_key()
+    user_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    pdf_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("pdfs.id"), nullable=False)
+    session_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="chat_sessions")
-    pdf = relationship("PDF", back_populates="chat_sessions")
-    messages = relationship("ChatMessage", back_populates="session")
+    user: Mapped[User] = relationship(back_populates="chat_sessions")
+    pdf: Mapped[PDF] = relationship(back_populates="chat_sessions")
+    messages: Mapped[List[ChatMessage]] = relationship(back_populates="session")
 
 class ChatMessage(Base):
     """Individual chat messages"""
     __tablename__ = "chat_messages"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    session_id = Column(String, ForeignKey("chat_sessions.id"), nullable=False)
-    message_type = Column(String(20), nullable=False)  # 'user' or 'assistant'
-    content = Column(Text, nullable=False)
-    timestamp = Column(DateTime, default=func.now())
+    id: Mapped[str] = _uuid_primary_key()
+    session_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("chat_sessions.id"), nullable=False)
+    message_type: Mapped[str] = mapped_column(String(20), nullable=False)  # 'user' or 'assistant'
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Partition key, so it is part of the table's primary key
+    timestamp: Mapped[datetime] = mapped_column(DateTime, primary_key=True, server_default=func.now())
     
     # AI response metadata
-    ai_model = Column(String(50), nullable=True)
-    response_time = Column(Float, nullable=True)
+    ai_model: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    response_time: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     
     # Relationships
-    session = relationship("ChatSession", back_populates="messages")
+    session: Mapped[ChatSession] = relationship(back_populates="messages")
+    
+    __table_args__ = (
+        # Chat history: WHERE session_id = ? ORDER BY timestamp, without a sort step
+        Index("idx_chat_messages_session_time", "session_id", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    # Rows are still identified by id alone
+    __mapper_args__ = {"primary_key": [id]}
 
 class Evaluation(Base):
     """Answer evaluations and quiz results"""
     __tablename__ = "evaluations"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    question_id = Column(String, ForeignKey("questions.id"), nullable=False)
+    id: Mapped[str] = _uuid_primary_key()
+    user_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    question_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("questions.id"), nullable=False)
     
     # Answer content
-    user_answer = Column(Text, nullable=False)
-    score = Column(Integer, nullable=False)  # 0-10
-    max_score = Column(Integer, default=10)
+    user_answer: Mapped[str] = mapped_column(Text, nullable=False)
+    score: Mapped[int] = mapped_column(SmallInteger, nullable=False)  # 0-10
+    max_score: Mapped[Optional[int]] = mapped_column(SmallInteger, default=10)
     
     # Evaluation details
-    feedback = Column(Text, nullable=True)
-    suggestions = Column(Text, nullable=True)
-    correct_answer_hint = Column(Text, nullable=True)
-    evaluation_level = Column(String(20), nullable=False)  # 'easy', 'medium', 'strict'
+    feedback: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    suggestions: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    correct_answer_hint: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    evaluation_level: Mapped[str] = mapped_column(String(20), nullable=False)  # 'easy', 'medium', 'strict'
     
     # Processing metadata
-    evaluation_time = Column(Float, nullable=True)  # Time taken to evaluate
-    ai_model = Column(String(50), nullable=True)
-    cache_hit = Column(Boolean, default=False)
+    evaluation_time: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Time taken to evaluate
+    ai_model: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    cache_hit: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
     
     # Timestamps
-    evaluated_at = Column(DateTime, default=func.now())
+    evaluated_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, server_default=func.now())  # Partition key
     
     # Relationships
-    question = relationship("Question", back_populates="evaluations")
+    question: Mapped[Question] = relationship(back_populates="evaluations")
+    
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (evaluated_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
 
 class QuizSession(Base):
     """Quiz sessions for tracking complete quiz attempts"""
     __tablename__ = "quiz_sessions"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    pdf_id = Column(String, ForeignKey("pdfs.id"), nullable=False)
-    question_set_id = Column(String, nullable=False)  # Links to questions used
+    id: Mapped[str] = _uuid_primary_key()
+    user_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    pdf_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("pdfs.id"), nullable=False)
+    question_set_id: Mapped[str] = mapped_column(String, nullable=False)  # Links to questions used
     
     # Quiz metadata
-    topic = Column(String(255), nullable=True)
-    total_questions = Column(Integer, nullable=False)
-    evaluation_level = Column(String(20), nullable=False)
+    topic: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    total_questions: Mapped[int] = mapped_column(Integer, nullable=False)
+    evaluation_level: Mapped[str] = mapped_column(String(20), nullable=False)
     
     # Results
-    total_score = Column(Integer, nullable=False)
-    max_score = Column(Integer, nullable=False)
-    percentage = Column(Float, nullable=False)
-    grade = Column(String(2), nullable=False)  # 'A', 'B', 'C', 'D', 'F'
+    total_score: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    max_score: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    percentage: Mapped[float] = mapped_column(Float, nullable=False)
+    grade: Mapped[str] = mapped_column(String(2), nullable=False)  # 'A', 'B', 'C', 'D', 'F'
     
     # AI-generated feedback
-    overall_feedback = Column(Text, nullable=True)
-    study_suggestions = Column(JSON, nullable=True)  # Array of suggestions
-    strengths = Column(JSON, nullable=True)  # Array of strengths
-    areas_for_improvement = Column(JSON, nullable=True)  # Array of areas
+    overall_feedback: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    study_suggestions: Mapped[Optional[Any]] = mapped_column(postgresql.JSONB, nullable=True)  # Array of suggestions
+    strengths: Mapped[Optional[Any]] = mapped_column(postgresql.JSONB, nullable=True)  # Array of strengths
+    areas_for_improvement: Mapped[Optional[Any]] = mapped_column(postgresql.JSONB, nullable=True)  # Array of areas
     
     # Timestamps
-    started_at = Column(DateTime, default=func.now())
-    completed_at = Column(DateTime, nullable=True)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
 class CacheEntry(Base):
     """Generic caching table for various cached data"""
     __tablename__ = "cache_entries"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    cache_key = Column(String(255), unique=True, nullable=False, index=True)
-    cache_type = Column(String(50), nullable=False, index=True)  # 'question_gen', 'evaluation', 'pdf_text'
-    data = Column(JSON, nullable=False)
-    expires_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    accessed_at = Column(DateTime, default=func.now())
-    access_count = Column(Integer, default=1)
+    id: Mapped[str] = _uuid_primary_key()
+    cache_key: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    cache_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # 'question_gen', 'evaluation', 'pdf_text'
+    data: Mapped[Any] = mapped_column(postgresql.JSONB, nullable=False)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    accessed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    access_count: Mapped[Optional[int]] = mapped_column(Integer, default=1)
+    
+    __table_args__ = (
+        # Index-only lookup of a key with its expiry. data is left out because
+        # large JSON values would exceed the b-tree row size limit.
+        Index(
+            "idx_cache_entries_key_type", "cache_key", "cache_type",
+            postgresql_include=["expires_at"]
+        ),
+    )
 
 class BackgroundJob(Base):
     """Background job tracking for async operations"""
     __tablename__ = "background_jobs"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    job_type = Column(String(50), nullable=False, index=True)  # 'question_generation', 'evaluation'
-    status = Column(String(20), nullable=False, index=True)  # 'pending', 'running', 'completed', 'failed'
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id: Mapped[str] = _uuid_primary_key()
+    job_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # 'question_generation', 'evaluation'
+    status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)  # 'pending', 'running', 'completed', 'failed'
+    user_id: Mapped[str] = mapped_column(postgresql.UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
     
     # Job parameters
-    parameters = Column(JSON, nullable=False)
-    result = Column(JSON, nullable=True)
-    error_message = Column(Text, nullable=True)
+    parameters: Mapped[Any] = mapped_column(postgresql.JSONB, nullable=False)
+    result: Mapped[Optional[Any]] = mapped_column(postgresql.JSONB, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Progress tracking
-    progress_percentage = Column(Integer, default=0)
-    progress_message = Column(String(255), nullable=True)
+    progress_percentage: Mapped[Optional[int]] = mapped_column(SmallInteger, default=0)
+    progress_message: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now())
-    started_at = Column(DateTime, nullable=True)
-    completed_at = Column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, server_default=func.now())  # Partition key
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Celery task ID for tracking
-    celery_task_id = Column(String(255), nullable=True, index=True)
+    celery_task_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
+    
+    __table_args__ = (
+        # Job poller: only unfinished jobs are indexed, which keeps the index small
+        Index(
+            "idx_background_jobs_status_type", "status", "job_type",
+            postgresql_where=text("status IN ('pending', 'running')")
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
+# Partitioned tables need at least one partition before they accept rows, and
+# maintain_partitions_periodically() expects maintain_partitions() to exist.
+# metadata.create_all() runs the same partition DDL as init.sql (keep in sync).
+_CREATE_MONTHLY_PARTITIONS_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent_table TEXT, months_ahead INTEGER DEFAULT 2)
+RETURNS VOID AS $$
+DECLARE
+    month_start DATE;
+BEGIN
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %%I PARTITION OF %%I DEFAULT',
+                   parent_table || '_default', parent_table);
+    
+    FOR i IN 0..months_ahead LOOP
+        month_start := (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::DATE;
+        EXECUTE format('CREATE TABLE IF NOT EXISTS %%I PARTITION OF %%I FOR VALUES FROM (%%L) TO (%%L)',
+                       parent_table || '_' || to_char(month_start, 'YYYY_MM'), parent_table,
+                       month_start, (month_start + INTERVAL '1 month')::DATE);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+""")
+
+_MAINTAIN_PARTITIONS_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION maintain_partitions()
+RETURNS VOID AS $$
+BEGIN
+    PERFORM create_monthly_partitions('chat_messages');
+    PERFORM create_monthly_partitions('evaluations');
+    PERFORM create_monthly_partitions('background_jobs');
+END;
+$$ LANGUAGE plpgsql
+""")
+
+for _ddl in (_CREATE_MONTHLY_PARTITIONS_FUNCTION, _MAINTAIN_PARTITIONS_FUNCTION, DDL("SELECT maintain_partitions()")):
+    event.listen(Base.metadata, "after_create", _ddl.execute_if(dialect="postgresql"))
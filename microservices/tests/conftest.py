@@ -0,0 +1,11 @@
+"""
+Test setup for the microservices: make the shared modules importable the
+same way the services do (sys.path entry for the shared directory).
+"""
+
+import os
+import sys
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
@@ -0,0 +1,38 @@
+"""
+Tests for APIKeyManager key selection.
+"""
+
+import time
+
+from ai.api_key_manager import APIKeyManager
+
+
+def _make_manager(tmp_path, num_keys=3):
+    keys_file = tmp_path / "api_keys.txt"
+    keys_file.write_text("\n".join(f"test-key-{i}" for i in range(num_keys)) + "\n")
+    return APIKeyManager(str(keys_file))
+
+
+def test_get_best_key_prunes_unselected_keys(tmp_path):
+    manager = _make_manager(tmp_path)
+    expired = time.monotonic() - manager.rate_limit_window - 1
+    for key_id in manager._key_ids:
+        manager.rate_limit_windows[key_id].extend([expired] * 10)
+
+    key_id, _ = manager.get_best_key()
+
+    # Only the request just recorded remains; stale entries are gone everywhere
+    for other_id in manager._key_ids:
+        expected = 1 if other_id == key_id else 0
+        assert len(manager.rate_limit_windows[other_id]) == expected
+
+
+def test_get_best_key_skips_key_at_rate_limit(tmp_path, monkeypatch):
+    monkeypatch.setenv("API_MAX_REQUESTS_PER_MINUTE", "5")
+    manager = _make_manager(tmp_path, num_keys=2)
+    now = time.monotonic()
+    manager.rate_limit_windows["key_1"].extend([now] * 5)
+
+    for _ in range(3):
+        key_id, _ = manager.get_best_key()
+        assert key_id == "key_2"
@@ -0,0 +1,60 @@
+"""
+Tests for the chat message bulk insert helper.
+"""
+
+import asyncio
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from database.config import bulk_insert_chat_messages
+
+_CREATE_CHAT_MESSAGES = text(
+    "CREATE TABLE chat_messages ("
+    "id CHAR(32) NOT NULL, session_id CHAR(32) NOT NULL, message_type VARCHAR(20) NOT NULL, "
+    "content TEXT NOT NULL, timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+    "ai_model VARCHAR(50), response_time FLOAT, PRIMARY KEY (id, timestamp))"
+)
+_COUNT = text("SELECT count(*) FROM chat_messages")
+
+
+def _messages(count):
+    return [
+        {"session_id": "7b0b3c5e-6f4a-4d55-9a3c-2f0f1d7f6a10", "message_type": "user", "content": f"message {i}"}
+        for i in range(count)
+    ]
+
+
+async def _run(commit):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, params, context, many: statements.append((statement, many))
+    )
+    async with engine.connect() as connection:
+        await connection.execute(_CREATE_CHAT_MESSAGES)
+        await connection.commit()
+        async with AsyncSession(bind=connection) as session:
+            statements.clear()
+            await bulk_insert_chat_messages(session, _messages(5))
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        count = await connection.scalar(_COUNT)
+    await engine.dispose()
+    return count, [(statement, many) for statement, many in statements if statement.startswith("INSERT")]
+
+
+def test_bulk_insert_is_one_executemany():
+    count, inserts = asyncio.run(_run(commit=True))
+    assert count == 5
+    assert len(inserts) == 1
+    statement, many = inserts[0]
+    assert many and "RETURNING" not in statement
+
+
+def test_bulk_insert_rolls_back_with_the_session():
+    count, _ = asyncio.run(_run(commit=False))
+    assert count == 0
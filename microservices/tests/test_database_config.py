@@ -0,0 +1,69 @@
+"""
+Tests for DatabaseConfig driver arguments and DatabaseManager setup.
+"""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database.config import DatabaseConfig, DatabaseManager, check_database_health, db_manager
+
+
+def test_pgbouncer_engine_args_use_unique_statement_names(monkeypatch):
+    monkeypatch.setenv("USE_PGBOUNCER", "1")
+    connect_args = DatabaseConfig().async_engine_connect_args()
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    names = {name_func() for _ in range(100)}
+    assert len(names) == 100
+    assert all(name.startswith("__asyncpg_") for name in names)
+
+
+def test_pgbouncer_raw_pool_args_disable_statement_cache(monkeypatch):
+    monkeypatch.setenv("USE_PGBOUNCER", "1")
+    config = DatabaseConfig()
+
+    # Only asyncpg.connect() arguments, no SQLAlchemy dialect options
+    assert config.asyncpg_connect_args() == {"statement_cache_size": 0}
+    assert config._host_and_port() == (config.PGBOUNCER_HOST, config.PGBOUNCER_PORT)
+
+
+def test_direct_engine_args_keep_statement_caches(monkeypatch):
+    monkeypatch.delenv("USE_PGBOUNCER", raising=False)
+    monkeypatch.setenv("DB_STATEMENT_CACHE_SIZE", "256")
+    connect_args = DatabaseConfig().async_engine_connect_args()
+
+    assert connect_args["statement_cache_size"] == 256
+    assert connect_args["prepared_statement_cache_size"] == 256
+    assert "prepared_statement_name_func" not in connect_args
+
+
+def test_init_session_factories_leaves_sync_engine_lazy(monkeypatch):
+    monkeypatch.delenv("USE_PGBOUNCER", raising=False)
+    manager = DatabaseManager()
+    monkeypatch.setattr(
+        manager, "_create_async_engine",
+        lambda url, pool_size, label, read_only=False: create_async_engine("sqlite+aiosqlite://")
+    )
+    monkeypatch.setattr(manager, "get_engine", lambda: pytest.fail("sync engine created"))
+
+    manager.init_session_factories()
+
+    assert manager._async_session_factory is not None
+    assert manager._session_factory is None
+
+
+def test_health_check_fails_fast_when_pool_cannot_be_created(monkeypatch):
+    async def unreachable():
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(db_manager.config, "HEALTH_CHECK_CONNECT_TIMEOUT", 0.05)
+    monkeypatch.setattr(db_manager, "get_asyncpg_pool", unreachable)
+
+    started = time.monotonic()
+    assert asyncio.run(check_database_health()) is False
+    assert time.monotonic() - started < 1
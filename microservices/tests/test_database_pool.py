@@ -0,0 +1,70 @@
+"""
+Tests for AutoSizingQueuePool resizing.
+"""
+
+import sqlite3
+
+from database.config import AutoSizingQueuePool
+
+
+def _make_pool(pool_size=8, max_overflow=4):
+    # A huge resize interval keeps the automatic resizer out of the way
+    return AutoSizingQueuePool(
+        lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        resize_interval=1e9
+    )
+
+
+def _fill(pool, count):
+    connections = [pool.connect() for _ in range(count)]
+    for connection in connections:
+        connection.close()
+
+
+def test_shrink_closes_surplus_idle_connections():
+    pool = _make_pool()
+    _fill(pool, 8)
+    assert pool.checkedin() == 8
+
+    pool._resize(2)
+
+    assert pool.checkedin() == 2
+    assert pool.overflow() == 0
+
+
+def test_shrink_holds_across_checkouts():
+    pool = _make_pool()
+    _fill(pool, 8)
+    pool._resize(2)
+
+    for _ in range(50):
+        pool.connect().close()
+
+    assert pool.checkedin() == 2
+    assert pool.checkedout() == 0
+
+
+def test_shrink_with_connections_checked_out():
+    pool = _make_pool()
+    _fill(pool, 4)
+    busy = [pool.connect() for _ in range(6)]
+    pool._resize(2)
+
+    # Returned connections beyond the new size are closed instead of queued
+    for connection in busy:
+        connection.close()
+    assert pool.checkedin() == 2
+    assert pool.overflow() == 0
+
+
+def test_grow_keeps_ceiling():
+    pool = _make_pool(pool_size=2, max_overflow=4)
+    pool._resize(5)
+
+    connections = [pool.connect() for _ in range(6)]
+    assert pool.checkedout() == 6
+    for connection in connections:
+        connection.close()
+    assert pool.checkedin() == 5
@@ -0,0 +1,56 @@
+"""
+Tests for the shared models: client id parsing, UUID keys and partition DDL.
+"""
+
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_mock_engine
+
+from database.models import Base, parse_uuid
+
+
+def test_parse_uuid_canonicalizes_valid_ids():
+    value = uuid.uuid4()
+    assert parse_uuid(str(value)) == str(value)
+    assert parse_uuid(str(value).upper()) == str(value)
+    assert parse_uuid(value.hex) == str(value)
+
+
+@pytest.mark.parametrize("value", ["", "not-a-uuid", "123", "job_42", "0" * 33, None])
+def test_parse_uuid_rejects_malformed_ids(value):
+    assert parse_uuid(value) is None
+
+
+def test_uuid_primary_keys_are_generated_client_side():
+    for table in Base.metadata.sorted_tables:
+        if "id" not in table.c or not table.c.id.primary_key:
+            continue
+        column = table.c.id
+        # A client-side default lets multi-row flushes batch into one INSERT
+        assert column.default is not None and column.default.is_callable, table.name
+        assert parse_uuid(column.default.arg(None)) is not None
+        assert "gen_random_uuid()" in str(column.server_default.arg)
+
+
+def _create_all_statements(url):
+    statements = []
+    engine = create_mock_engine(url, lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=engine.dialect))))
+    Base.metadata.create_all(engine, checkfirst=False)
+    return [" ".join(statement.split()) for statement in statements]
+
+
+def test_create_all_bootstraps_partitions_like_init_sql():
+    statements = _create_all_statements("postgresql+asyncpg://")
+    init_sql_path = Path(__file__).resolve().parent.parent / "shared" / "database" / "init.sql"
+    init_sql = " ".join(init_sql_path.read_text().split())
+
+    # Functions are created after every table, then run once
+    assert statements[-1] == "SELECT maintain_partitions()"
+    functions = statements[-3:-1]
+    assert "FUNCTION create_monthly_partitions(" in functions[0]
+    assert "FUNCTION maintain_partitions()" in functions[1]
+    for function in functions:
+        assert function in init_sql
+
@@ -0,0 +1,43 @@
+"""
+Round-trip tests for the tagged Redis value serialization.
+"""
+
+import pytest
+
+from cache.redis_config import RedisManager
+
+
+@pytest.fixture
+def manager():
+    return RedisManager()
+
+
+def _round_trip(manager, value):
+    return manager._deserialize_data(manager._serialize_data(value))
+
+
+@pytest.mark.parametrize("value", [
+    (1, 2, 3),
+    ("question", ("a", "b"), b"raw"),
+    ((1, 2), [3, 4]),
+    {1, 2, 3},
+])
+def test_non_json_values_keep_their_types(manager, value):
+    result = _round_trip(manager, value)
+    assert result == value
+    assert type(result) is type(value)
+
+
+def test_tuple_inside_tuple_stays_a_tuple(manager):
+    result = _round_trip(manager, (("pdf_1", 3), ("pdf_2", 5)))
+    assert result == (("pdf_1", 3), ("pdf_2", 5))
+    assert all(type(item) is tuple for item in result)
+
+
+def test_bytes_round_trip(manager):
+    assert _round_trip(manager, b"\x00\xffpayload") == b"\x00\xffpayload"
+
+
+@pytest.mark.parametrize("value", [{"questions": ["q1", "q2"], "count": 2}, ["a", 1, None], "text", 42, None])
+def test_json_values_round_trip(manager, value):
+    assert _round_trip(manager, value) == value